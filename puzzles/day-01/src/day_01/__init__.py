@@ -1,14 +1,30 @@
 import sys
+from mmap import mmap
 
-from .solution import part1, part2
+import numpy as np
+from aoc_2024.cache import load_input
+
+from .solution import Locations, part1, part2, read_locations
+
+
+def encode_input(data: bytes | mmap) -> bytes:
+    """Both lists back to back as 64-bit ints"""
+
+    list1, list2 = read_locations(data)
+    return list1.tobytes() + list2.tobytes()
+
+
+def decode_input(data: memoryview) -> Locations:
+    ints = np.frombuffer(data, dtype=np.int64)
+    half = len(ints) // 2
+    return Locations(ints[:half], ints[half:])
 
 
 def main() -> None:
     day_str = sys.argv[0].split("/")[-1]
     print(day_str)
     print(f"Hello from {day_str}!")
-    with open(f"inputs/{day_str}.txt", "r") as file:
-        lines = file.readlines()
+    locations = decode_input(load_input(f"inputs/{day_str}.txt", encode_input))
 
-    print(part1(lines))
-    print(part2(lines))
+    print(part1(locations))
+    print(part2(locations))
@@ -1,48 +1,82 @@
-from collections import defaultdict
+from mmap import mmap
 
+import numpy as np
+import numpy.typing as npt
 
-def split_input(input: list[str]) -> tuple[list[int], list[int]]:
-    """Split the input into two lists"""
+# One column of location IDs
+IDs = npt.NDArray[np.int64]
 
-    list1: list[int] = []
-    list2: list[int] = []
+CHUNK_SIZE = 1 << 24
+COUNTING_RATIO = 4
 
-    # Idea for improvement: insert into a min heap and later pop from it,
-    # that way it's already sorted and we can avoid the two sorts
-    for line in input:
-        [item1, item2] = line.split()
-        list1.append(int(item1))
-        list2.append(int(item2))
 
-    return list1, list2
+def read_locations(data: bytes | mmap, chunk_size: int = CHUNK_SIZE) -> tuple[IDs, IDs]:
+    """Parse both columns of location IDs from the raw input a chunk at a time,
+    so the text is never held as lines and the IDs never as Python ints"""
 
+    chunks: list[IDs] = [np.zeros(0, dtype=np.int64)]
 
-def part1(input: list[str]):
-    print("Hello from part1!")
+    start = 0
+    while start < len(data):
+        # Cut every chunk after a newline so no pair is split between two
+        end = len(data)
+        if start + chunk_size < end:
+            end = data.rfind(b"\n", start, start + chunk_size) + 1 or end
 
-    list1, list2 = split_input(input)
+        # Parsed in C, any whitespace separates two IDs
+        chunks.append(np.fromstring(data[start:end], dtype=np.int64, sep=" "))
 
-    list1.sort()
-    list2.sort()
+        start = end
 
-    total_dst = 0
-    for item1, item2 in zip(list1, list2):
-        total_dst += abs(item1 - item2)
+    ids = np.concatenate(chunks)
+    return ids[0::2], ids[1::2]
 
-    return total_dst
 
+class Locations:
+    """Both lists of location IDs"""
 
-def part2(input: list[str]):
-    print("Hello from part2!")
+    list1: IDs
+    list2: IDs
+
+    def __init__(self, list1: IDs, list2: IDs) -> None:
+        self.list1 = list1
+        self.list2 = list2
+
+
+def sort_ids(ids: IDs, lo: int, hi: int) -> IDs:
+    """The IDs in order. A counting sort when every value between lo and hi
+    repeats often enough on average to beat sorting them"""
+
+    span = hi - lo + 1
+    if len(ids) < COUNTING_RATIO * span:
+        return np.sort(ids)
+
+    counts = np.bincount(ids - lo, minlength=span)
+    return np.repeat(np.arange(lo, hi + 1, dtype=np.int64), counts)
 
-    list1, list2 = split_input(input)
 
-    counts: dict[int, int] = defaultdict(int)
-    for item in list2:
-        counts[item] += 1
+def part1(locations: Locations):
+    print("Hello from part1!")
+
+    list1, list2 = locations.list1, locations.list2
+    if len(list1) == 0:
+        return 0
+
+    lo = int(min(list1.min(), list2.min()))
+    hi = int(max(list1.max(), list2.max()))
+    return int(np.abs(sort_ids(list1, lo, hi) - sort_ids(list2, lo, hi)).sum())
+
+
+def part2(locations: Locations):
+    print("Hello from part2!")
+
+    list1, list2 = locations.list1, locations.list2
+    if len(list2) == 0:
+        return 0
 
-    similarity = 0
-    for item in list1:
-        similarity += counts[item] * item
+    # Look every ID of the first list up among the distinct IDs of the second
+    ids, counts = np.unique(list2, return_counts=True)
+    index = np.minimum(np.searchsorted(ids, list1), len(ids) - 1)
+    found = ids[index] == list1
 
-    return similarity
+    return int((list1 * counts[index] * found).sum())
@@ -1,14 +1,38 @@
+import argparse
 import sys
 
 from .solution import part1, part2
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="check all reports at once as NumPy arrays",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="stream the input in chunks to this many processes",
+    )
+    args = parser.parse_args()
+
     day_str = sys.argv[0].split("/")[-1]
     print(day_str)
     print(f"Hello from {day_str}!")
+
+    if args.workers:
+        # Only streaming needs the process pool
+        from .stream import count_file
+
+        safe1, safe2 = count_file(f"inputs/{day_str}.txt", args.workers)
+        print(safe1)
+        print(safe2)
+        return
+
     with open(f"inputs/{day_str}.txt", "r") as file:
         lines = file.readlines()
 
-    print(part1(lines))
-    print(part2(lines))
+    print(part1(lines, batch=args.batch))
+    print(part2(lines, batch=args.batch))
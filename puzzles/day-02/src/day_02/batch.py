@@ -0,0 +1,90 @@
+from itertools import combinations
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+POWERS_OF_10 = 10 ** np.arange(19, dtype=np.int64)
+
+
+class Reports(NamedTuple):
+    """Every report as a row of a 2-D array, padded with zeros past its length"""
+
+    levels: npt.NDArray[np.int64]
+    lengths: npt.NDArray[np.int64]
+
+
+def pack_reports(data: bytes) -> Reports:
+    """Parse the whole input at once, finding the numbers from the digits in
+    the raw bytes instead of splitting it up line by line"""
+
+    buf = np.frombuffer(data, dtype=np.uint8)
+    is_digit = (buf >= ord("0")) & (buf <= ord("9"))
+
+    digits = np.flatnonzero(is_digit)
+    if len(digits) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return Reports(empty.reshape(0, 0), empty)
+
+    edges = np.diff(is_digit.view(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    sizes = ends - starts
+
+    # Every digit is worth 10 to the power of how far it is from the end of
+    # its number, a running sum of those gives each number as a difference
+    place = POWERS_OF_10[np.repeat(ends, sizes) - 1 - digits]
+    worth = np.cumsum((buf[digits] - ord("0")) * place)
+    last = np.cumsum(sizes) - 1
+    values = worth[last] - np.concatenate(([0], worth[last[:-1]]))
+    values[buf[np.maximum(starts - 1, 0)] == ord("-")] *= -1
+
+    # Numbers are on the same line when as many newlines come before them,
+    # renumbered so empty lines don't leave gaps
+    newlines = np.cumsum(buf == ord("\n"), dtype=np.int32)[starts]
+    line = np.cumsum(np.diff(newlines, prepend=newlines[0]) != 0)
+
+    lengths = np.bincount(line)
+    offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    column = np.arange(len(line)) - offsets
+
+    levels = np.zeros((len(lengths), int(lengths.max())), dtype=np.int64)
+    levels[line, column] = values
+
+    return Reports(levels, lengths.astype(np.int64))
+
+
+def safe_mask(
+    levels: npt.NDArray[np.int64], lengths: npt.NDArray[np.int64]
+) -> npt.NDArray[np.bool_]:
+    diffs: npt.NDArray[np.int64] = np.diff(levels, axis=1)
+    # Differences past the end of a report are padding and can't make it unsafe
+    padding = np.arange(int(diffs.shape[1])) >= (lengths - 1)[:, None]
+
+    increasing = ((diffs >= 1) & (diffs <= 3)) | padding
+    decreasing = ((diffs >= -3) & (diffs <= -1)) | padding
+    return increasing.all(axis=1) | decreasing.all(axis=1)
+
+
+def count_safe(reports: Reports, removals: int = 0) -> int:
+    """How many reports are safe once at most removals levels are left out,
+    trying every way to leave them out for all reports at once"""
+
+    levels, lengths = reports
+    width = levels.shape[1]
+
+    safe = safe_mask(levels, lengths)
+    if removals == 0:
+        return int(safe.sum())
+
+    # Only the reports that aren't safe yet need another look
+    levels, lengths = levels[~safe], lengths[~safe]
+    fixed = np.zeros(len(lengths), dtype=np.bool_)
+    for n in range(1, removals + 1):
+        for removed in combinations(range(width), n):
+            # Only reports long enough to have all of these levels
+            has_levels = lengths > removed[-1]
+            kept = np.delete(levels, removed, axis=1)
+            fixed |= has_levels & safe_mask(kept, lengths - n)
+
+    return int(safe.sum() + fixed.sum())
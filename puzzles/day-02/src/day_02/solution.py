@@ -1,97 +1,96 @@
-def is_safe(levels: list[int], increasing: bool) -> bool:
-    prev_level = levels[0]
-    for i, level in enumerate(levels):
-        if i == 0:
-            continue
-
-        if (level < prev_level and increasing) or (
-            level > prev_level and not increasing
-        ):
-            return False
-
-        diff = abs(level - prev_level)
-        if diff < 1 or diff > 3:
-            return False
-
-        prev_level = level
-
-    return True
-
-
-def is_mostly_increasing(levels: list[int]) -> bool:
-    inc = 0
-    dec = 0
+from collections.abc import Sequence
+from operator import sub
 
-    for i, level in enumerate(levels):
-        if i == 0:
-            continue
-        if level > levels[i - 1]:
-            inc += 1
-        elif level < levels[i - 1]:
-            dec += 1
+# Stands in for removal counts that are already over the limit
+TOO_MANY = 1 << 62
 
-    return inc > dec
 
+def is_safe(levels: Sequence[int], removals: int = 0) -> bool:
+    """Whether the levels only increase or only decrease, by 1 to 3 at a time,
+    once at most removals of them are left out. Takes a single pass that
+    looks back removals + 1 levels, so it's linear in the length of a report
+    for any fixed number of removals"""
 
-def is_safe_recursive(
-    levels: list[int], increasing: bool, prev_level_idx: int, idx: int, threshold: int
-) -> bool:
-    if idx >= len(levels):
+    n = len(levels)
+    if n <= removals + 1:
         return True
 
-    if (levels[idx] < levels[prev_level_idx] and increasing) or (
-        levels[idx] > levels[prev_level_idx] and not increasing
-    ):
-        if threshold <= 0:
-            return False
-        elif prev_level_idx == 0:
-            return is_safe_recursive(
-                levels, increasing, prev_level_idx, idx + 1, threshold - 1
-            ) or is_safe_recursive(levels, increasing, idx, idx + 1, threshold - 1)
-        else:
-            return is_safe_recursive(
-                levels, increasing, prev_level_idx, idx + 1, threshold - 1
-            ) or is_safe_recursive(
-                levels, increasing, prev_level_idx - 1, idx, threshold - 1
-            )
-
-    diff = abs(levels[idx] - levels[prev_level_idx])
-    if diff < 1 or diff > 3:
-        if threshold <= 0:
+    # Most reports need no removals at all, which the differences alone tell
+    # without any looping in Python
+    diffs = list(map(sub, levels[1:], levels))
+    lo, hi = min(diffs), max(diffs)
+    if 1 <= lo and hi <= 3 or -3 <= lo and hi <= -1:
+        return True
+    if removals == 0:
+        return False
+
+    # Fewest removals that make a safe increasing or decreasing run ending on
+    # each level. Only the last removals + 1 levels can come before it in a run
+    inc = [0] * n
+    dec = [0] * n
+    last_reachable = -1
+
+    for i in range(n):
+        level = levels[i]
+        # Leaving out every level before this one always works
+        best_inc = best_dec = i if i <= removals else TOO_MANY
+
+        for j in range(max(0, i - removals - 1), i):
+            diff = level - levels[j]
+            if 1 <= diff <= 3:
+                if inc[j] + i - j - 1 < best_inc:
+                    best_inc = inc[j] + i - j - 1
+            elif -3 <= diff <= -1:
+                if dec[j] + i - j - 1 < best_dec:
+                    best_dec = dec[j] + i - j - 1
+
+        inc[i], dec[i] = best_inc, best_dec
+
+        fewest = best_inc if best_inc < best_dec else best_dec
+        if fewest + n - 1 - i <= removals:
+            # The rest of the report can be left out if need be
+            return True
+
+        if fewest <= removals:
+            last_reachable = i
+        elif i >= removals and i - last_reachable > removals:
+            # A safe run would have to go through one of the last removals + 1
+            # levels, and none of them can be reached
             return False
-        elif prev_level_idx == 0:
-            return is_safe_recursive(
-                levels, increasing, prev_level_idx, idx + 1, threshold - 1
-            ) or is_safe_recursive(levels, increasing, idx, idx + 1, threshold - 1)
-        else:
-            return is_safe_recursive(
-                levels, increasing, prev_level_idx, idx + 1, threshold - 1
-            ) or is_safe_recursive(
-                levels, increasing, prev_level_idx - 1, idx, threshold - 1
-            )
 
-    return is_safe_recursive(levels, increasing, idx, idx + 1, threshold)
+    return False
 
 
-def part1(input: list[str]):
+def part1(input: list[str], batch: bool = False):
     print("Hello from part1!")
 
+    if batch:
+        # NumPy is only needed for batches
+        from .batch import count_safe, pack_reports
+
+        return count_safe(pack_reports("".join(input).encode()))
+
     safe = 0
     for line in input:
         levels: list[int] = list(map(lambda x: int(x), line.split(" ")))
-        if is_safe(levels, is_mostly_increasing(levels)):
+        if is_safe(levels):
             safe += 1
 
     return safe
 
 
-def part2(input: list[str]):
+def part2(input: list[str], batch: bool = False):
     print("Hello from part2!")
 
+    if batch:
+        from .batch import count_safe, pack_reports
+
+        return count_safe(pack_reports("".join(input).encode()), removals=1)
+
     safe = 0
     for line in input:
         levels: list[int] = list(map(lambda x: int(x), line.split(" ")))
-        if is_safe_recursive(levels, is_mostly_increasing(levels), 0, 1, 1):
+        if is_safe(levels, removals=1):
             safe += 1
 
     return safe
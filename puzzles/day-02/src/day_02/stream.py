@@ -0,0 +1,66 @@
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from .solution import is_safe
+
+CHUNK_SIZE = 1 << 20
+
+
+def read_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Read a file in blocks of chunk_size bytes, each cut after its last
+    newline so no report is split between two chunks"""
+
+    with open(path, "rb") as file:
+        rest = b""
+        while block := file.read(chunk_size):
+            block = rest + block
+            cut = block.rfind(b"\n") + 1
+            yield block[:cut]
+            rest = block[cut:]
+
+        if rest:
+            yield rest
+
+
+def count_chunk(chunk: bytes) -> tuple[int, int]:
+    """Safe reports in a chunk, without and with one removal"""
+
+    safe1 = safe2 = 0
+    for line in chunk.splitlines():
+        levels = list(map(int, line.split()))
+        if not levels:
+            continue
+
+        if is_safe(levels):
+            safe1 += 1
+            safe2 += 1
+        elif is_safe(levels, removals=1):
+            safe2 += 1
+
+    return safe1, safe2
+
+
+def count_file(
+    path: str, workers: int, chunk_size: int = CHUNK_SIZE
+) -> tuple[int, int]:
+    """Count safe reports for both parts in one pass over the file, a chunk per
+    task. Only a couple of chunks per worker are read ahead, so memory use
+    doesn't grow with the file"""
+
+    safe1 = safe2 = 0
+    pending: deque[Future[tuple[int, int]]] = deque()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in read_chunks(path, chunk_size):
+            if len(pending) >= workers * 2:
+                counts = pending.popleft().result()
+                safe1, safe2 = safe1 + counts[0], safe2 + counts[1]
+
+            pending.append(pool.submit(count_chunk, chunk))
+
+        for future in pending:
+            counts = future.result()
+            safe1, safe2 = safe1 + counts[0], safe2 + counts[1]
+
+    return safe1, safe2
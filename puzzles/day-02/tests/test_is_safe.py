@@ -0,0 +1,55 @@
+import random
+from itertools import combinations
+
+import pytest
+from day_02.solution import is_safe
+
+
+def brute_force(levels: list[int], removals: int) -> bool:
+    """Try leaving out every combination of at most removals levels"""
+
+    for n in range(min(removals, len(levels)) + 1):
+        for removed in combinations(range(len(levels)), n):
+            kept = [level for i, level in enumerate(levels) if i not in removed]
+            diffs = [b - a for a, b in zip(kept, kept[1:])]
+            if all(1 <= d <= 3 for d in diffs) or all(-3 <= d <= -1 for d in diffs):
+                return True
+
+    return False
+
+
+def random_report(rng: random.Random) -> list[int]:
+    # Mostly safe steps with a few bad ones, so removals often matter
+    levels = [rng.randint(1, 20)]
+    direction = rng.choice([-1, 1])
+    for _ in range(rng.randint(0, 9)):
+        if rng.random() < 0.8:
+            step = direction * rng.randint(1, 3)
+        else:
+            step = rng.randint(-6, 6)
+        levels.append(levels[-1] + step)
+
+    return levels
+
+
+@pytest.mark.parametrize("removals", [0, 1, 2, 3])
+def test_matches_brute_force(removals: int):
+    rng = random.Random(removals)
+    for _ in range(5000):
+        levels = random_report(rng)
+        assert is_safe(levels, removals) == brute_force(levels, removals), levels
+
+
+@pytest.mark.parametrize(
+    ("levels", "safe"),
+    [
+        ([7, 6, 4, 2, 1], True),
+        ([1, 2, 7, 8, 9], False),
+        ([9, 7, 6, 2, 1], False),
+        ([1, 3, 2, 4, 5], True),
+        ([8, 6, 4, 4, 1], True),
+        ([1, 3, 6, 7, 9], True),
+    ],
+)
+def test_example_with_one_removal(levels: list[int], safe: bool):
+    assert is_safe(levels, removals=1) == safe
@@ -1,11 +1,17 @@
 import sys
+from mmap import ACCESS_READ, mmap
 
-from .solution import part1, part2
+from .solution import chunks, part1, part2, scan
 
 
 def main() -> None:
     day_str = sys.argv[0].split("/")[-1]
     print(f"Hello from {day_str}!")
 
-    with open(f"inputs/{day_str}.txt", "r") as file:
-        lines = file.readlines()
+    # Both parts come out of the same pass over the mapped input
+    with open(f"inputs/{day_str}.txt", "rb") as file:
+        with mmap(file.fileno(), 0, access=ACCESS_READ) as data:
+            total, enabled_total = scan(chunks(data))
+
+    print(total)
+    print(enabled_total)
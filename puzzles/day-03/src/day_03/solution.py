@@ -0,0 +1,94 @@
+import re
+from collections.abc import Iterable
+from mmap import mmap
+
+# Kept apart so each pattern starts with a literal, which the regex engine
+# finds far faster than an alternation
+MUL = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)")
+TOGGLE = re.compile(rb"do(n't)?\(\)")
+
+# Bytes that can't be part of any instruction, blocks are cut after one so no
+# instruction is ever split
+SEPARATOR = re.compile(rb"[^0-9mulont'(),d]")
+
+CHUNK_SIZE = 1 << 20
+
+
+def chunks(data: bytes | mmap, chunk_size: int = CHUNK_SIZE) -> Iterable[bytes]:
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+def last_cut(buf: bytes) -> int:
+    """Position after the last separator in buf, 0 if it has none"""
+
+    window = 4096
+    while True:
+        start = max(0, len(buf) - window)
+
+        cut = 0
+        for match in SEPARATOR.finditer(buf, start):
+            cut = match.end()
+
+        if cut or start == 0:
+            return cut
+
+        window *= 2
+
+
+def sum_muls(buf: bytes, start: int, end: int) -> int:
+    return sum(int(x) * int(y) for x, y in MUL.findall(buf, start, end))
+
+
+def scan(blocks: Iterable[bytes]) -> tuple[int, int]:
+    """Sum the multiplications in one pass over the corrupted memory, returns
+    the sum of all of them and of only the enabled ones. Instructions may be
+    split between blocks"""
+
+    total = enabled_total = 0
+    enabled = True
+
+    buf = b""
+    blocks = iter(blocks)
+    done = False
+    while not done:
+        block = next(blocks, None)
+        if block is None:
+            done = True
+        else:
+            buf += block
+
+        # Whatever comes after the cut might continue in the next block
+        cut = len(buf) if done else last_cut(buf)
+
+        # Sum the multiplications between toggles a stretch at a time
+        pos = 0
+        for toggle in TOGGLE.finditer(buf, 0, cut):
+            product = sum_muls(buf, pos, toggle.start())
+            total += product
+            if enabled:
+                enabled_total += product
+
+            enabled = toggle[1] is None
+            pos = toggle.end()
+
+        product = sum_muls(buf, pos, cut)
+        total += product
+        if enabled:
+            enabled_total += product
+
+        buf = buf[cut:]
+
+    return total, enabled_total
+
+
+def part1(input: list[str]):
+    print("Hello from part1!")
+
+    return scan(chunks("".join(input).encode()))[0]
+
+
+def part2(input: list[str]):
+    print("Hello from part2!")
+
+    return scan(chunks("".join(input).encode()))[1]
@@ -0,0 +1,71 @@
+import random
+import re
+
+import pytest
+from day_03.solution import chunks, scan
+
+TOKENS = [
+    "mul(",
+    "mul",
+    "mu",
+    "(",
+    ")",
+    ",",
+    "1",
+    "23",
+    "456",
+    "7890",
+    "do()",
+    "don't()",
+    "do",
+    "don't",
+    "'",
+    "x",
+    " ",
+    "\n",
+    "mul(2,4)",
+    "mul(123,456)",
+]
+
+
+def reference(text: bytes) -> tuple[int, int]:
+    """Both sums from a single regex over the whole text"""
+
+    total = enabled_total = 0
+    enabled = True
+    for match in re.finditer(rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)", text):
+        if match[0] == b"do()":
+            enabled = True
+        elif match[0] == b"don't()":
+            enabled = False
+        else:
+            product = int(match[1]) * int(match[2])
+            total += product
+            if enabled:
+                enabled_total += product
+
+    return total, enabled_total
+
+
+def random_blocks(rng: random.Random, text: bytes) -> list[bytes]:
+    blocks: list[bytes] = []
+    start = 0
+    while start < len(text):
+        end = start + rng.randint(1, 50)
+        blocks.append(text[start:end])
+        start = end
+
+    return blocks
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_split_blocks_match_reference(seed: int):
+    rng = random.Random(seed)
+    for _ in range(50):
+        text = "".join(rng.choices(TOKENS, k=rng.randint(0, 200))).encode()
+        assert scan(random_blocks(rng, text)) == reference(text), text
+
+
+def test_chunks_cover_the_input():
+    text = b"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+    assert scan(chunks(text, chunk_size=3)) == (161, 48)
@@ -1,20 +1,126 @@
+import argparse
 import sys
+from array import array
+from contextlib import ExitStack
+from mmap import mmap
+from pathlib import Path
 
-from .solution import part1, part2
+from aoc_2024.cache import load_input
+from aoc_2024.measure import counting, memory_tracing, tracing
+
+from .solution import Board, part1, part2
+
+
+def encode_input(data: bytes | mmap) -> bytes:
+    """The row width as a 64-bit int, then the rows back to back, one byte per
+    cell"""
+
+    rows = data[:].splitlines()
+    width = len(rows[0]) if rows else 0
+    return array("q", [width]).tobytes() + b"".join(rows)
+
+
+def decode_input(data: memoryview) -> Board:
+    """The board straight out of the mapped cache, without copying the cells"""
+
+    return Board(data[8:], data[:8].cast("q")[0])
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of processes to check part 2 obstacle candidates with",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="solve on a bytearray grid with integer encoded guard states",
+    )
+    parser.add_argument(
+        "--render",
+        action="store_true",
+        help="render part 2 frames into images while solving",
+    )
+    parser.add_argument(
+        "--render-every",
+        type=int,
+        default=1,
+        help="only render every Nth frame",
+    )
+    parser.add_argument(
+        "--render-turns-only",
+        action="store_true",
+        help="only render frames where the guard turns",
+    )
+    parser.add_argument(
+        "--render-output",
+        type=Path,
+        default=Path("puzzles/day-06/src/day_06/images"),
+        help="directory of PNG frames, a .gif file or a raw .rgb frame stream",
+    )
+    parser.add_argument(
+        "--render-fps",
+        type=int,
+        default=30,
+        help="frame rate of an animated GIF",
+    )
+    parser.add_argument(
+        "--render-scale",
+        type=int,
+        default=1,
+        help="downscale GIF and raw frames by this factor",
+    )
+    parser.add_argument(
+        "--trace",
+        help="trace where the time goes and save it as a Chrome trace to this file",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="run each part a second time to trace its peak memory use",
+    )
+    parser.add_argument(
+        "--counters",
+        action="store_true",
+        help="count what the search does and print a summary at the end",
+    )
+    args = parser.parse_args()
+    if args.memory and args.render:
+        parser.error("--memory would render every frame a second time")
+
     day_str = sys.argv[0].split("/")[-1]
     print(f"Hello from {day_str}!")
 
-    with open(f"inputs/{day_str}.txt", "r") as file:
-        lines = file.readlines()
+    with ExitStack() as stack:
+        if args.trace:
+            stack.enter_context(tracing(args.trace))
+        if args.counters:
+            stack.enter_context(counting())
+        if args.memory:
+            stack.enter_context(memory_tracing())
+
+        solve(day_str, args)
 
-    board: list[list[str]] = []
-    for line in lines:
-        board.append([*line])
 
-    result = part1(board)
+def solve(day_str: str, args: argparse.Namespace):
+    board = decode_input(load_input(f"inputs/{day_str}.txt", encode_input))
+
+    result = part1(board, compact=args.compact)
     print(f"Output: {result}")
-    result2 = part2(board)
+    if args.render:
+        # Pillow is only needed when rendering
+        from .render import FrameRenderer, open_sink
+
+        with FrameRenderer(
+            board.rows(),
+            every=args.render_every,
+            turns_only=args.render_turns_only,
+            sink=open_sink(args.render_output, args.render_fps, args.render_scale),
+        ) as renderer:
+            result2 = part2(board, renderer=renderer)
+    else:
+        result2 = part2(board, workers=args.workers, compact=args.compact)
     print(f"Output: {result2}")
@@ -0,0 +1,419 @@
+from functools import cache
+from pathlib import Path
+from queue import Queue
+from threading import Thread
+from types import TracebackType
+from typing import IO, NamedTuple, Protocol, Self
+
+from PIL import GifImagePlugin, Image, ImageDraw, ImageFont
+from aoc_2024.measure import span, traced
+from aoc_2024.vector import Vector
+
+from .solution import Direction, Tile
+
+# pyright: reportUnknownMemberType=false
+
+FONT_PATH = "JetBrainsMonoNerdFont-Regular.ttf"
+OUTPUT_DIR = Path("puzzles/day-06/src/day_06/images")
+
+DIRECTION_SYMBOLS = {
+    Direction.NORTH: "↑",
+    Direction.SOUTH: "↓",
+    Direction.WEST: "←",
+    Direction.EAST: "→",
+}
+
+# Common direction combinations
+COMBINED_SYMBOLS = {
+    frozenset([Direction.NORTH, Direction.SOUTH]): "↕",
+    frozenset([Direction.WEST, Direction.EAST]): "↔",
+    frozenset([Direction.NORTH, Direction.EAST]): "↗",
+    frozenset([Direction.NORTH, Direction.WEST]): "↖",
+    frozenset([Direction.SOUTH, Direction.EAST]): "↘",
+    frozenset([Direction.SOUTH, Direction.WEST]): "↙",
+    frozenset(
+        [Direction.NORTH, Direction.SOUTH, Direction.WEST, Direction.EAST]
+    ): "*",  # star for all directions
+    frozenset([Direction.NORTH, Direction.SOUTH, Direction.EAST]): "⊢",
+    frozenset([Direction.NORTH, Direction.SOUTH, Direction.WEST]): "⊣",
+    frozenset([Direction.NORTH, Direction.WEST, Direction.EAST]): "⊥",
+    frozenset([Direction.SOUTH, Direction.WEST, Direction.EAST]): "⊤",
+}
+
+
+@cache
+def load_font(size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(FONT_PATH, size)
+
+
+@cache
+def glyph(symbol: str, fill: str, cell_size: int) -> Image.Image:
+    """Draw a symbol once onto a transparent tile the size of a cell"""
+
+    tile = Image.new("RGBA", (cell_size, cell_size), (0, 0, 0, 0))
+    ImageDraw.Draw(tile).text(
+        (cell_size // 2, cell_size // 2),
+        symbol,
+        fill=fill,
+        font=load_font(cell_size),
+        anchor="mm",
+    )
+    return tile
+
+
+def symbol_for(directions: frozenset[Direction]) -> str:
+    if len(directions) == 1:
+        return DIRECTION_SYMBOLS[next(iter(directions))]
+    elif directions in COMBINED_SYMBOLS:
+        return COMBINED_SYMBOLS[directions]
+
+    # Fall back to overlapping arrows for unknown combinations
+    return "+".join(DIRECTION_SYMBOLS[d] for d in directions)
+
+
+# Box of pixels (left, upper, right, lower) that changed since the last frame
+Box = tuple[int, int, int, int]
+
+
+class CellChange(NamedTuple):
+    pos: Vector
+    on_path: bool
+    traversed: frozenset[Direction]
+    guard: bool
+
+
+class Canvas:
+    """Persistent frame that only repaints the cells that changed, obstacles
+    never change so they are drawn once up front"""
+
+    image: Image.Image
+    draw: ImageDraw.ImageDraw
+    obstacles: set[Vector]
+    cell_size: int
+
+    def __init__(
+        self, grid_size: Vector, obstacles: list[Vector], cell_size: int = 20
+    ) -> None:
+        # grid_size is (rows, columns) like every other position on the grid
+        self.image = Image.new(
+            "RGBA", (grid_size.y * cell_size, grid_size.x * cell_size), color="black"
+        )
+        self.draw = ImageDraw.Draw(self.image)
+        self.obstacles = set(obstacles)
+        self.cell_size = cell_size
+
+        for obstacle in self.obstacles:
+            self.fill(obstacle, "white")
+
+    def fill(self, pos: Vector, fill: str):
+        self.draw.rectangle(
+            xy=[
+                (pos.y * self.cell_size, pos.x * self.cell_size),
+                (
+                    pos.y * self.cell_size + self.cell_size - 1,
+                    pos.x * self.cell_size + self.cell_size - 1,
+                ),
+            ],
+            fill=fill,
+            outline=None,
+        )
+
+    def paste(self, pos: Vector, tile: Image.Image):
+        self.image.paste(
+            tile, (pos.y * self.cell_size, pos.x * self.cell_size), mask=tile
+        )
+
+    def bounds(self, changes: list[CellChange]) -> Box:
+        if not changes:
+            return (0, 0, 0, 0)
+
+        return (
+            min(change.pos.y for change in changes) * self.cell_size,
+            min(change.pos.x for change in changes) * self.cell_size,
+            (max(change.pos.y for change in changes) + 1) * self.cell_size,
+            (max(change.pos.x for change in changes) + 1) * self.cell_size,
+        )
+
+    def apply(self, changes: list[CellChange]):
+        for change in changes:
+            if change.pos in self.obstacles:
+                self.fill(change.pos, "white")
+            elif change.on_path:
+                self.fill(change.pos, "blue")
+            else:
+                self.fill(change.pos, "black")
+
+            if change.traversed:
+                symbol = symbol_for(change.traversed)
+                self.paste(change.pos, glyph(symbol, "yellow", self.cell_size))
+
+            if change.guard:
+                self.paste(change.pos, glyph("G", "white", self.cell_size))
+
+
+class FrameSink(Protocol):
+    def write(self, image: Image.Image, box: Box | None, frame_num: int): ...
+
+    def close(self): ...
+
+
+class PngSink:
+    """Saves every frame as its own PNG file"""
+
+    output_dir: Path
+
+    def __init__(self, output_dir: Path = OUTPUT_DIR) -> None:
+        self.output_dir = output_dir
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def write(self, image: Image.Image, box: Box | None, frame_num: int):
+        image.save(self.output_dir / f"grid-{frame_num}.png")
+
+    def close(self):
+        pass
+
+
+def downscale(image: Image.Image, box: Box, scale: int) -> tuple[Image.Image, Box]:
+    # Snap the box to the scale so the reduced crop lines up with the reduced frame
+    left, upper = box[0] // scale * scale, box[1] // scale * scale
+    right = min(-(-box[2] // scale) * scale, image.width)
+    lower = min(-(-box[3] // scale) * scale, image.height)
+
+    crop = image.crop((left, upper, right, lower))
+    if scale > 1:
+        crop = crop.reduce(scale)
+
+    return crop, (left // scale, upper // scale, right // scale, lower // scale)
+
+
+def make_palette() -> Image.Image:
+    """Fixed palette of the colors frames are drawn with, plus the shades glyph
+    antialiasing blends between them"""
+
+    base = [(0, 0, 0), (255, 255, 255), (0, 0, 255), (255, 255, 0)]
+    colors: list[tuple[int, int, int]] = list(base)
+    for i, a in enumerate(base):
+        for b in base[i + 1 :]:
+            for step in range(1, 8):
+                t = step / 8
+                colors.append(
+                    (
+                        round(a[0] + (b[0] - a[0]) * t),
+                        round(a[1] + (b[1] - a[1]) * t),
+                        round(a[2] + (b[2] - a[2]) * t),
+                    )
+                )
+
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([channel for color in colors for channel in color])
+    return palette
+
+
+class GifSink:
+    """Streams frames into a single looping GIF. Every frame is quantized to one
+    fixed palette and only the changed box of it is written, so nothing but the
+    previous frame's size is kept in memory"""
+
+    file: IO[bytes]
+    duration: int
+    scale: int
+    palette: Image.Image
+    started: bool
+
+    def __init__(self, path: Path, fps: int = 30, scale: int = 1) -> None:
+        self.file = open(path, "wb")
+        self.duration = round(1000 / fps)
+        self.scale = scale
+        self.palette = make_palette()
+        self.started = False
+
+    def write(self, image: Image.Image, box: Box | None, frame_num: int):
+        if not self.started or box is None:
+            box = (0, 0, image.width, image.height)
+
+        # Frames that changed nothing still have to take up their share of time
+        if box[2] <= box[0] or box[3] <= box[1]:
+            box = (0, 0, 1, 1)
+
+        crop, offset = downscale(image, box, self.scale)
+        frame = crop.convert("RGB").quantize(
+            palette=self.palette, dither=Image.Dither.NONE
+        )
+
+        if not self.started:
+            header, _ = GifImagePlugin.getheader(frame, info={"loop": 0})
+            self.file.writelines(header)
+            self.started = True
+
+        self.file.writelines(
+            GifImagePlugin.getdata(frame, offset[:2], duration=self.duration)
+        )
+
+    def close(self):
+        if self.started:
+            self.file.write(b";")
+        self.file.close()
+
+
+class RawSink:
+    """Writes each frame as raw RGB bytes, e.g. into a named pipe read by ffmpeg
+    with -f rawvideo -pix_fmt rgb24"""
+
+    file: IO[bytes]
+    scale: int
+
+    def __init__(self, path: Path, scale: int = 1) -> None:
+        self.file = open(path, "wb")
+        self.scale = scale
+
+    def write(self, image: Image.Image, box: Box | None, frame_num: int):
+        frame, _ = downscale(image, (0, 0, image.width, image.height), self.scale)
+        self.file.write(frame.convert("RGB").tobytes())
+
+    def close(self):
+        self.file.close()
+
+
+def open_sink(output: Path, fps: int = 30, scale: int = 1) -> FrameSink:
+    """Pick a sink from the output path, .gif streams an animation, .rgb writes a
+    raw frame stream and anything else is a directory of PNGs"""
+
+    if output.suffix == ".gif":
+        return GifSink(output, fps=fps, scale=scale)
+    elif output.suffix == ".rgb":
+        return RawSink(output, scale=scale)
+
+    return PngSink(output)
+
+
+class FrameRenderer:
+    """Keeps a log of the cells the solver changed and hands only those over to
+    a background thread, which applies them to a canvas and writes sampled frames
+    to a sink"""
+
+    every: int
+    turns_only: bool
+    frame_num: int
+
+    on_path: set[Vector]
+    traversed: dict[Vector, set[Direction]]
+    guard_pos: Vector | None
+    dirty: set[Vector]
+
+    canvas: Canvas
+    sink: FrameSink
+    queue: Queue[tuple[list[CellChange], int] | None]
+    worker: Thread
+    error: BaseException | None
+
+    def __init__(
+        self,
+        board: list[list[str]],
+        every: int = 1,
+        turns_only: bool = False,
+        cell_size: int = 20,
+        queue_size: int = 64,
+        sink: FrameSink | None = None,
+    ) -> None:
+        self.every = every
+        self.turns_only = turns_only
+        self.frame_num = 0
+
+        self.on_path = set()
+        self.traversed = {}
+        self.guard_pos = None
+        self.dirty = set()
+
+        obstacles = [
+            Vector(x, y)
+            for x, row in enumerate(board)
+            for y, item in enumerate(row)
+            if item == Tile.OBSTACLE.value
+        ]
+        self.canvas = Canvas(Vector(len(board), len(board[0])), obstacles, cell_size)
+        self.sink = sink if sink is not None else PngSink()
+        self.queue = Queue(maxsize=queue_size)
+        self.error = None
+
+        self.worker = Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def path(self, pos: Vector):
+        if pos not in self.on_path:
+            self.on_path.add(pos)
+            self.dirty.add(pos)
+
+    def traverse(self, pos: Vector, dir: Direction):
+        self.traversed.setdefault(pos, set()).add(dir)
+        self.dirty.add(pos)
+
+    def clear_traversed(self):
+        self.dirty.update(self.traversed)
+        self.traversed.clear()
+
+    def guard(self, pos: Vector):
+        if self.guard_pos is not None:
+            self.dirty.add(self.guard_pos)
+        self.guard_pos = pos
+        self.dirty.add(pos)
+
+    @traced
+    def frame(self, turn: bool):
+        """End the current frame, it is only rendered if it is sampled. Changes
+        from skipped frames carry over into the next rendered one"""
+
+        if self.turns_only and not turn:
+            return
+
+        self.frame_num += 1
+        if (self.frame_num - 1) % self.every != 0:
+            return
+
+        changes = [
+            CellChange(
+                pos,
+                pos in self.on_path,
+                frozenset(self.traversed.get(pos, ())),
+                pos == self.guard_pos,
+            )
+            for pos in self.dirty
+        ]
+        self.dirty.clear()
+
+        # Blocks while the queue is full so a slow renderer can't pile up frames
+        self.queue.put((changes, self.frame_num - 1))
+
+    def close(self):
+        self.queue.put(None)
+        self.worker.join()
+        self.sink.close()
+
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        while (item := self.queue.get()) is not None:
+            if self.error is not None:
+                continue
+
+            changes, frame_num = item
+            try:
+                with span("render frame"):
+                    self.canvas.apply(changes)
+                    self.sink.write(
+                        self.canvas.image, self.canvas.bounds(changes), frame_num
+                    )
+            except BaseException as e:
+                # Keep draining the queue so the solver doesn't block on it
+                self.error = e
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
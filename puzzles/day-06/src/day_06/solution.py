@@ -1,12 +1,10 @@
+from bisect import bisect_left, bisect_right, insort
 from enum import auto, Enum
-from typing import Final, TypedDict, override
+from typing import Final, NamedTuple, Protocol
 
-from PIL import Image, ImageDraw, ImageFont
-from aoc_2024.measure import measure
+from aoc_2024.measure import count, measure, observe, traced
 from aoc_2024.vector import Vector
 
-# pyright: reportUnknownMemberType=false
-
 
 class Direction(Enum):
     NORTH = Vector(-1, 0)
@@ -24,132 +22,46 @@ class Tile(Enum):
     EMPTY = "."
 
 
-class Elements(TypedDict):
-    guard_pos: Vector
-    obstacles: list[Vector]
-    original_path: list[Vector]
-    traversed: list[tuple[Vector, list[Direction]]]
+class Board(NamedTuple):
+    """The map as its rows back to back, one byte per cell"""
 
+    cells: bytes | memoryview
+    width: int
 
-def visualize_grid(
-    grid_size: Vector, elements: Elements, cell_size: int = 20, frame_num: int = 0
-):
-    direction_symbols = {
-        Direction.NORTH: "↑",
-        Direction.SOUTH: "↓",
-        Direction.WEST: "←",
-        Direction.EAST: "→",
-    }
-
-    # Common direction combinations
-    combined_symbols = {
-        frozenset([Direction.NORTH, Direction.SOUTH]): "↕",
-        frozenset([Direction.WEST, Direction.EAST]): "↔",
-        frozenset([Direction.NORTH, Direction.EAST]): "↗",
-        frozenset([Direction.NORTH, Direction.WEST]): "↖",
-        frozenset([Direction.SOUTH, Direction.EAST]): "↘",
-        frozenset([Direction.SOUTH, Direction.WEST]): "↙",
-        frozenset(
-            [Direction.NORTH, Direction.SOUTH, Direction.WEST, Direction.EAST]
-        ): "*",  # star for all directions
-        frozenset([Direction.NORTH, Direction.SOUTH, Direction.EAST]): "⊢",
-        frozenset([Direction.NORTH, Direction.SOUTH, Direction.WEST]): "⊣",
-        frozenset([Direction.NORTH, Direction.WEST, Direction.EAST]): "⊥",
-        frozenset([Direction.SOUTH, Direction.WEST, Direction.EAST]): "⊤",
-    }
-
-    # Create a new image
-    grid = Image.new(
-        "RGBA", (grid_size.y * cell_size, grid_size.x * cell_size), color="black"
-    )
-
-    draw = ImageDraw.Draw(grid)
-    # Draw obstacles
-    for obstacle in elements["obstacles"]:
-        draw.rectangle(
-            xy=[
-                (obstacle.y * cell_size, obstacle.x * cell_size),
-                (
-                    obstacle.y * cell_size + cell_size - 1,
-                    obstacle.x * cell_size + cell_size - 1,
-                ),
-            ],
-            fill="white",
-            outline=None,
-        )
-
-    # Draw original path
-    for path_pos in elements["original_path"]:
-        draw.rectangle(
-            xy=[
-                (path_pos.y * cell_size, path_pos.x * cell_size),
-                (
-                    path_pos.y * cell_size + cell_size - 1,
-                    path_pos.x * cell_size + cell_size - 1,
-                ),
-            ],
-            fill="blue",
-            outline=None,
-        )
-    # Draw traversed positons
-    for pos, directions in elements["traversed"]:
-        frozen_dirs = frozenset(directions)
-        if len(directions) == 1:
-            symbol = direction_symbols[list(directions)[0]]
-        elif frozen_dirs in combined_symbols:
-            symbol = combined_symbols[frozen_dirs]
-        else:
-            # Fall back to overlapping arrows for unknown combinations
-            symbol = "+".join(direction_symbols[d] for d in directions)
-
-        draw.text(
-            (pos.y * cell_size + cell_size // 2, pos.x * cell_size + cell_size // 2),
-            symbol,
-            fill="yellow",
-            font=ImageFont.truetype(
-                "JetBrainsMonoNerdFont-Regular.ttf",
-                24,
-            ),
-            anchor="mm",
-        )
-
-    # Draw guard position
-    draw.text(
-        (
-            elements["guard_pos"].y * cell_size + cell_size // 2,
-            elements["guard_pos"].x * cell_size + cell_size // 2,
-        ),
-        "G",
-        font=ImageFont.truetype(
-            "JetBrainsMonoNerdFont-Regular.ttf",
-            24,
-        ),
-        anchor="mm",
-    )
-
-    # Draw grid
-    # for i in range(grid_size.x + 1):
-    #     draw.line(
-    #         [(0, i * cell_size), (grid_size.y * cell_size, i * cell_size)],
-    #         fill="gray",
-    #         width=1,
-    #     )
-    #
-    # for i in range(grid_size.y + 1):
-    #     draw.line(
-    #         [(i * cell_size, 0), (i * cell_size, grid_size.x * cell_size)],
-    #         fill="gray",
-    #         width=1,
-    #     )
-
-    grid.save(f"puzzles/day-06/src/day_06/images/grid-{frame_num}.png")
+    def rows(self) -> list[list[str]]:
+        cells = bytes(self.cells).decode()
+        return [[*cells[i : i + self.width]] for i in range(0, len(cells), self.width)]
+
+
+class Renderer(Protocol):
+    def path(self, pos: Vector): ...
+
+    def traverse(self, pos: Vector, dir: Direction): ...
+
+    def clear_traversed(self): ...
+
+    def guard(self, pos: Vector): ...
+
+    def frame(self, turn: bool): ...
 
 
 class Grid:
     board: list[list[str]]
+    # Sorted obstacle columns per row and obstacle rows per column, used to jump
+    # straight to the next obstacle instead of walking cell by cell
+    rows: list[list[int]]
+    cols: list[list[int]]
 
     def __init__(self, board: list[list[str]]) -> None:
         self.board = board
+        self.rows = [[] for _ in range(self.x)]
+        self.cols = [[] for _ in range(self.y)]
+
+        for x, row in enumerate(board):
+            for y, item in enumerate(row):
+                if item == Tile.OBSTACLE.value:
+                    self.rows[x].append(y)
+                    self.cols[y].append(x)
 
     @property
     def x(self):
@@ -159,15 +71,47 @@ class Grid:
     def y(self):
         return len(self.board[0])
 
+    @traced
     def place(self, pos: Vector, tile: Tile):
+        was_obstacle = self.board[pos.x][pos.y] == Tile.OBSTACLE.value
         self.board[pos.x][pos.y] = tile.value
 
+        # Only the row and column of the placed tile need their index updated
+        if tile is Tile.OBSTACLE and not was_obstacle:
+            insort(self.rows[pos.x], pos.y)
+            insort(self.cols[pos.y], pos.x)
+        elif tile is not Tile.OBSTACLE and was_obstacle:
+            self.rows[pos.x].remove(pos.y)
+            self.cols[pos.y].remove(pos.x)
+
     def at(self, x: int, y: int) -> str:
         return self.board[x][y]
 
     def in_bounds(self, pos: Vector):
         return pos.x >= 0 and pos.x < self.x and pos.y >= 0 and pos.y < self.y
 
+    def next_obstacle(self, pos: Vector, dir: Direction) -> Vector:
+        """Find the first obstacle from pos in the given direction, or the first
+        position off the grid if there isn't one"""
+
+        match dir:
+            case Direction.NORTH:
+                col = self.cols[pos.y]
+                i = bisect_left(col, pos.x)
+                return Vector(col[i - 1] if i > 0 else -1, pos.y)
+            case Direction.SOUTH:
+                col = self.cols[pos.y]
+                i = bisect_right(col, pos.x)
+                return Vector(col[i] if i < len(col) else self.x, pos.y)
+            case Direction.WEST:
+                row = self.rows[pos.x]
+                i = bisect_left(row, pos.y)
+                return Vector(pos.x, row[i - 1] if i > 0 else -1)
+            case Direction.EAST:
+                row = self.rows[pos.x]
+                i = bisect_right(row, pos.y)
+                return Vector(pos.x, row[i] if i < len(row) else self.y)
+
     def __iter__(self):
         return iter(self.board)
 
@@ -216,7 +160,21 @@ class Guard:
 
         self.pos = next_step
 
+    def jump(self, grid: Grid) -> bool:
+        """Move up to the next obstacle and turn right, returns False if the guard
+        walked off the grid instead"""
+
+        stop = grid.next_obstacle(self.pos, self.dir)
+        if not grid.in_bounds(stop):
+            self.pos = stop
+            return False
+
+        self.pos = stop - self.dir.value
+        self.turn_right()
+        return True
 
+
+@traced
 def find_guard(board: Grid) -> Vector:
     for x, row in enumerate(board):
         for y, item in enumerate(row):
@@ -227,21 +185,178 @@ def find_guard(board: Grid) -> Vector:
     return Vector(0, 0)
 
 
+# Directions in the order the guard turns through them, compact mode stores a
+# direction as its index in here
+TURN_ORDER: Final = (Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST)
+
+
+class CompactGrid:
+    """Grid stored as a single bytearray indexed by x * width + y"""
+
+    cells: bytearray
+    width: int
+    height: int
+    rows: list[list[int]]
+    cols: list[list[int]]
+
+    def __init__(self, board: Board) -> None:
+        self.width = board.width
+        self.height = len(board.cells) // board.width
+        self.cells = bytearray(board.cells)
+        self.rows = [[] for _ in range(self.height)]
+        self.cols = [[] for _ in range(self.width)]
+
+        # Jumps from obstacle to obstacle instead of looking at every cell
+        obstacle = ord(Tile.OBSTACLE.value)
+        i = self.cells.find(obstacle)
+        while i != -1:
+            x, y = divmod(i, self.width)
+            self.rows[x].append(y)
+            self.cols[y].append(x)
+            i = self.cells.find(obstacle, i + 1)
+
+    def find_guard(self) -> tuple[int, int]:
+        return divmod(self.cells.index(ord(Tile.GUARD_NORTH.value)), self.width)
+
+    def is_obstacle(self, x: int, y: int) -> bool:
+        return self.cells[x * self.width + y] == ord(Tile.OBSTACLE.value)
+
+    def place_obstacle(self, x: int, y: int):
+        self.cells[x * self.width + y] = ord(Tile.OBSTACLE.value)
+        insort(self.rows[x], y)
+        insort(self.cols[y], x)
+
+    def remove_obstacle(self, x: int, y: int):
+        self.cells[x * self.width + y] = ord(Tile.EMPTY.value)
+        self.rows[x].remove(y)
+        self.cols[y].remove(x)
+
+    def jump(self, x: int, y: int, dir: int) -> tuple[int, int] | None:
+        """Find where the guard stops in front of the next obstacle, or None if
+        it walks off the grid"""
+
+        match dir:
+            case 0:
+                col = self.cols[y]
+                i = bisect_left(col, x)
+                return (col[i - 1] + 1, y) if i > 0 else None
+            case 1:
+                row = self.rows[x]
+                i = bisect_right(row, y)
+                return (x, row[i] - 1) if i < len(row) else None
+            case 2:
+                col = self.cols[y]
+                i = bisect_right(col, x)
+                return (col[i] - 1, y) if i < len(col) else None
+            case _:
+                row = self.rows[x]
+                i = bisect_left(row, y)
+                return (x, row[i - 1] + 1) if i > 0 else None
+
+
+def compact_path_length(grid: CompactGrid) -> int:
+    x, y = grid.find_guard()
+    dir = 0
+
+    visited = bytearray(grid.width * grid.height)
+    while True:
+        stop = grid.jump(x, y, dir)
+        dx, dy = TURN_ORDER[dir].value.x, TURN_ORDER[dir].value.y
+
+        if stop is None:
+            # Walk to the edge of the grid
+            while 0 <= x < grid.height and 0 <= y < grid.width:
+                visited[x * grid.width + y] = 1
+                x, y = x + dx, y + dy
+            return sum(visited)
+
+        while (x, y) != stop:
+            visited[x * grid.width + y] = 1
+            x, y = x + dx, y + dy
+
+        dir = (dir + 1) % 4
+
+
+@traced
+def compact_will_it_loop(
+    grid: CompactGrid, x: int, y: int, dir: int, seen: bytearray
+) -> bool:
+    # A state is a flag at ((x * width + y) * 4 + dir) in seen, the flags this run
+    # sets are cleared again before returning so seen can be reused
+    touched: list[int] = []
+    loops = False
+
+    while (stop := grid.jump(x, y, dir)) is not None:
+        x, y = stop
+        dir = (dir + 1) % 4
+
+        state = (x * grid.width + y) * 4 + dir
+        if seen[state]:
+            loops = True
+            break
+
+        seen[state] = 1
+        touched.append(state)
+
+    for state in touched:
+        seen[state] = 0
+
+    observe("turns per candidate", len(touched))
+    return loops
+
+
+def compact_count_loops(grid: CompactGrid) -> int:
+    x, y = grid.find_guard()
+    dir = 0
+
+    placed = bytearray(grid.width * grid.height)
+    placed[x * grid.width + y] = 1
+    seen = bytearray(grid.width * grid.height * 4)
+
+    loops = 0
+    while True:
+        dx, dy = TURN_ORDER[dir].value.x, TURN_ORDER[dir].value.y
+        nx, ny = x + dx, y + dy
+        if not (0 <= nx < grid.height and 0 <= ny < grid.width):
+            return loops
+
+        if grid.is_obstacle(nx, ny):
+            dir = (dir + 1) % 4
+            continue
+
+        if not placed[nx * grid.width + ny]:
+            placed[nx * grid.width + ny] = 1
+            count("candidates checked")
+
+            grid.place_obstacle(nx, ny)
+            if compact_will_it_loop(grid, x, y, dir, seen):
+                loops += 1
+            grid.remove_obstacle(nx, ny)
+        else:
+            count("candidates skipped, already tried")
+
+        x, y = nx, ny
+
+
 @measure
-def part1(board: list[list[str]]):
-    grid = Grid(board)
+def part1(board: Board, compact: bool = False):
+    if compact:
+        return compact_path_length(CompactGrid(board))
+
+    grid = Grid(board.rows())
     init_pos: Final[Vector] = find_guard(grid)
     guard = Guard(init_pos, Direction.NORTH)
 
     visited: set[Vector] = set([guard.pos])
-    while grid.in_bounds(guard.pos):
-        next_step = guard.next_step(grid)
-        if grid.at(next_step.x, next_step.y) == Tile.OBSTACLE.value:
-            guard.turn_right()
+    on_grid = True
+    while on_grid:
+        start, dir = guard.pos, guard.dir
+        on_grid = guard.jump(grid)
+        end = guard.pos if on_grid else guard.pos - dir.value
 
-        guard.step(grid)
-        if grid.in_bounds(guard.pos):
-            visited.add(guard.pos)
+        dist = abs(end.x - start.x) + abs(end.y - start.y)
+        for i in range(1, dist + 1):
+            visited.add(Vector(start.x + dir.value.x * i, start.y + dir.value.y * i))
 
     return len(visited)
 
@@ -251,161 +366,203 @@ class Destination(Enum):
     LOOP = auto()
 
 
-Visited = set[tuple[Vector, Direction]]
-
-
-class Counter(int):
-    value: int = 0
+# Built once so counting a candidate doesn't format a name every time
+DESTINATION_COUNTERS: Final = {
+    dest: f"candidates ending in {dest.name}" for dest in Destination
+}
 
-    @override
-    def __str__(self):
-        return f"{self.value}"
+Visited = set[tuple[Vector, Direction]]
 
 
+@traced
 def will_it_loop(
     grid: Grid,
-    obstacles: list[Vector],
     guard_pos: Vector,
     guard_dir: Direction,
-    original_path: Visited,
-    will_loop: Visited,
-    off_grid: Visited,
-    frames: Counter,
-) -> tuple[Visited, Destination, bool]:
+    renderer: Renderer | None,
+) -> tuple[Visited, Destination]:
     guard = Guard(guard_pos, guard_dir)
-    visited: Visited = set()
-
-    obs_start = guard.pos + guard.dir.value
-    avoid = set(
-        [
-            (obs_start + Direction.NORTH.value, Direction.SOUTH),
-            (obs_start + Direction.EAST.value, Direction.WEST),
-            (obs_start + Direction.SOUTH.value, Direction.NORTH),
-            (obs_start + Direction.WEST.value, Direction.EAST),
-        ]
-    )
-
-    intersects: bool = False
+
+    # Only the turns are recorded, the guard is in a loop as soon as it makes the
+    # same turn twice
+    turns: Visited = set()
+    dest = Destination.OFF_THE_GRID
+    walked = 0
+
+    while True:
+        start = guard.pos
+        on_grid = guard.jump(grid)
+        walked += abs(guard.pos.x - start.x) + abs(guard.pos.y - start.y)
+
+        if not on_grid:
+            break
+
+        if (guard.pos, guard.dir) in turns:
+            dest = Destination.LOOP
+            break
+
+        turns.add((guard.pos, guard.dir))
+
+        if renderer is not None:
+            renderer.traverse(guard.pos, guard.dir)
+            renderer.guard(guard.pos)
+            renderer.frame(turn=True)
+
+    count(DESTINATION_COUNTERS[dest])
+    observe("turns per candidate", len(turns))
+    observe("cells walked per candidate", walked)
+    return turns, dest
+
+
+Candidate = tuple[Vector, Vector, Direction]
+
+
+@traced
+def find_candidates(grid: Grid) -> list[Candidate]:
+    """Walk the original path and collect every position an obstacle can be placed
+    on, along with the guard's position and direction right before reaching it"""
+
+    guard = Guard(find_guard(grid), Direction.NORTH)
+    placed: set[Vector] = set([guard.pos])
+    candidates: list[Candidate] = []
+
     while grid.in_bounds(guard.pos):
+        next_step = guard.next_step(grid)
+
+        if grid.in_bounds(next_step) and next_step not in placed:
+            candidates.append((next_step, guard.pos, guard.dir))
+            placed.add(next_step)
+
         guard.step(grid)
 
-        if (guard.pos, guard.dir) in original_path or (guard.pos, guard.dir) in avoid:
-            intersects = True
+    return candidates
 
-        if (guard.pos, guard.dir) in off_grid:
-            return visited, Destination.OFF_THE_GRID, intersects
 
-        if (guard.pos, guard.dir) in will_loop:
-            return visited, Destination.LOOP, intersects
+# Each worker process gets its own copy of the grid to place candidates on
+_worker_grid: Grid | None = None
 
-        if (guard.pos, guard.dir) in visited:
-            return visited, Destination.LOOP, intersects
 
-        if grid.in_bounds(guard.pos):
-            visited.add((guard.pos, guard.dir))
+def _init_worker(shm_name: str, dim_x: int, dim_y: int) -> None:
+    global _worker_grid
 
-        ahead = guard.pos + guard.dir.value
-        if grid.in_bounds(ahead) and grid.at(ahead.x, ahead.y) == Tile.OBSTACLE.value:
-            visualize_grid(
-                Vector(grid.y, grid.x),
-                visualization_adapter(
-                    obstacles, will_loop, off_grid, guard, original_path.union(visited)
-                ),
-                frame_num=frames,
-            )
-        frames.value += 1
-
-    return visited, Destination.OFF_THE_GRID, intersects
-
-
-def visualization_adapter(
-    obstacles: list[Vector],
-    will_loop: Visited,
-    off_grid: Visited,
-    guard: Guard,
-    original_path: Visited,
-) -> Elements:
-    traversed_dict: dict[Vector, list[Direction]] = dict()
-    for pos, dir in will_loop:
-        if pos not in traversed_dict:
-            traversed_dict[pos] = [dir]
-        else:
-            traversed_dict[pos].append(dir)
+    from multiprocessing.shared_memory import SharedMemory
 
-    for pos, dir in off_grid:
-        if pos not in traversed_dict:
-            traversed_dict[pos] = [dir]
-        else:
-            traversed_dict[pos].append(dir)
+    shm = SharedMemory(shm_name, track=False)
+    assert shm.buf is not None
+    data = bytes(shm.buf[: dim_x * dim_y])
+    shm.close()
+
+    board = [list(data[x * dim_y : (x + 1) * dim_y].decode()) for x in range(dim_x)]
+    _worker_grid = Grid(board)
+
+
+def _count_loops(candidates: list[Candidate]) -> int:
+    grid = _worker_grid
+    assert grid is not None
+
+    loops = 0
+    for obstacle, guard_pos, guard_dir in candidates:
+        grid.place(obstacle, Tile.OBSTACLE)
+        _, dest = will_it_loop(grid, guard_pos, guard_dir, None)
+        grid.place(obstacle, Tile.EMPTY)
+
+        if dest is Destination.LOOP:
+            loops += 1
+
+    return loops
+
+
+@traced
+def count_loops_parallel(grid: Grid, candidates: list[Candidate], workers: int) -> int:
+    # Imported here since multiprocessing is slow to import and only needed here
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
 
-    traversed = [(pos, dirs) for pos, dirs in traversed_dict.items()]
-    return {
-        "guard_pos": guard.pos,
-        "obstacles": obstacles,
-        "original_path": [pos for pos, _ in original_path],
-        "traversed": traversed,
-    }
+    # The board is handed to the workers once through shared memory instead of
+    # being pickled along with every batch of candidates
+    data = "".join("".join(row) for row in grid).encode()
+    shm = SharedMemory(create=True, size=len(data))
 
+    try:
+        assert shm.buf is not None
+        shm.buf[: len(data)] = data
 
-# On top of intersection, need to also make sure that it's never interacted with the placed obstacles, must exclude 4 directions around the obstacle
+        # A few batches per worker keeps them busy without paying IPC per candidate
+        size = max(1, len(candidates) // (workers * 4))
+        batches = [candidates[i : i + size] for i in range(0, len(candidates), size)]
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shm.name, grid.x, grid.y),
+        ) as pool:
+            return sum(pool.map(_count_loops, batches))
+    finally:
+        shm.close()
+        shm.unlink()
 
 
 @measure
-def part2(board: list[list[str]]):
-    grid = Grid(board)
+def part2(
+    board: Board,
+    workers: int = 1,
+    compact: bool = False,
+    renderer: Renderer | None = None,
+):
+    if compact:
+        return compact_count_loops(CompactGrid(board))
 
-    obstacles = [
-        Vector(x, y)
-        for x, row in enumerate(grid)
-        for y, item in enumerate(row)
-        if item == Tile.OBSTACLE.value
-    ]
+    grid = Grid(board.rows())
+
+    if workers > 1:
+        return count_loops_parallel(grid, find_candidates(grid), workers)
 
     init_pos: Final[Vector] = find_guard(grid)
     guard = Guard(init_pos, Direction.NORTH)
 
-    placed: set[Vector] = set()
-    original_path: Visited = set([(guard.pos, guard.dir)])
-    will_loop: Visited = set()
-    off_grid: Visited = set()
+    # The guard would notice an obstacle placed on a position it already walked
+    # through, so each position is only tried the first time the guard reaches it
+    placed: set[Vector] = set([init_pos])
+
+    if renderer is not None:
+        renderer.path(guard.pos)
+        renderer.guard(guard.pos)
 
     loops = 0
-    frames = Counter()
+    steps = 0
     while grid.in_bounds(guard.pos):
+        dir = guard.dir
         next_step = guard.next_step(grid)
 
-        if next_step not in placed:
+        if next_step in placed:
+            count("candidates skipped, already tried")
+        elif grid.in_bounds(next_step):
+            # Checking from where the guard is now saves walking up to it again
+            count("candidates checked")
+            count("original path steps reused", steps)
+
             grid.place(next_step, Tile.OBSTACLE)
 
-            visited, dest, intersects = will_it_loop(
+            _, dest = will_it_loop(
                 grid=grid,
-                obstacles=obstacles,
                 guard_pos=guard.pos,
                 guard_dir=guard.dir,
-                original_path=original_path,
-                will_loop=will_loop,
-                off_grid=off_grid,
-                frames=frames,
+                renderer=renderer,
             )
 
             if dest is Destination.LOOP:
                 loops += 1
-                if not intersects:
-                    will_loop |= visited
-            elif not intersects:
-                off_grid |= visited
 
             grid.place(next_step, Tile.EMPTY)
             placed.add(next_step)
 
         guard.step(grid)
-        original_path.add((guard.pos, guard.dir))
-
-        visualize_grid(
-            Vector(grid.y, grid.x),
-            visualization_adapter(obstacles, will_loop, off_grid, guard, original_path),
-            frame_num=frames,
-        )
-        frames.value += 1
+        steps += 1
+
+        if renderer is not None:
+            renderer.clear_traversed()
+            renderer.path(guard.pos)
+            renderer.guard(guard.pos)
+            renderer.frame(turn=guard.dir is not dir)
 
     return loops
@@ -0,0 +1,114 @@
+import random
+
+import pytest
+from day_06 import decode_input, encode_input
+from day_06.solution import Board, part1, part2
+
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+
+def walk(
+    rows: list[str], x: int, y: int, obstacle: tuple[int, int] | None = None
+) -> tuple[bool, set[tuple[int, int]]]:
+    """Walk the guard a cell at a time, returns whether it loops and the cells
+    it visits"""
+
+    height, width = len(rows), len(rows[0])
+    dir = 0
+    seen: set[tuple[int, int, int]] = set()
+    cells: set[tuple[int, int]] = set()
+
+    while (x, y, dir) not in seen:
+        seen.add((x, y, dir))
+        cells.add((x, y))
+
+        nx, ny = x + DIRECTIONS[dir][0], y + DIRECTIONS[dir][1]
+        if not (0 <= nx < height and 0 <= ny < width):
+            return False, cells
+
+        if rows[nx][ny] == "#" or (nx, ny) == obstacle:
+            dir = (dir + 1) % 4
+        else:
+            x, y = nx, ny
+
+    return True, cells
+
+
+def brute_force(rows: list[str]) -> tuple[int, int]:
+    x = next(i for i, row in enumerate(rows) if "^" in row)
+    y = rows[x].index("^")
+
+    _, cells = walk(rows, x, y)
+    loops = sum(walk(rows, x, y, cell)[0] for cell in cells if cell != (x, y))
+    return len(cells), loops
+
+
+def random_board(rng: random.Random) -> list[str]:
+    """A board whose guard walks off it, with obstacles anywhere including the
+    edges and sometimes right in front of the guard"""
+
+    while True:
+        height, width = rng.randint(3, 20), rng.randint(3, 20)
+        density = rng.choice([0.1, 0.2, 0.3])
+        cells = [
+            ["#" if rng.random() < density else "." for _ in range(width)]
+            for _ in range(height)
+        ]
+
+        x, y = rng.randrange(height), rng.randrange(width)
+        cells[x][y] = "^"
+        if x > 0 and rng.random() < 0.2:
+            cells[x - 1][y] = "#"
+
+        rows = ["".join(row) for row in cells]
+        if not walk(rows, x, y)[0]:
+            return rows
+
+
+def load(rows: list[str]) -> Board:
+    return decode_input(memoryview(encode_input("\n".join(rows).encode() + b"\n")))
+
+
+EXAMPLE = [
+    "....#.....",
+    ".........#",
+    "..........",
+    "..#.......",
+    ".......#..",
+    "..........",
+    ".#..^.....",
+    "........#.",
+    "#.........",
+    "......#...",
+]
+
+RNG = random.Random(6)
+BOARDS = [
+    EXAMPLE,
+    # Facing an obstacle on the top edge, with obstacles along every edge
+    ["#.#.#", "..^..", "#...#", ".....", "#.#.#"],
+    *(random_board(RNG) for _ in range(400)),
+]
+
+
+@pytest.mark.parametrize(
+    ("compact", "workers"),
+    [(False, 1), (True, 1), (False, 2)],
+    ids=["grid", "compact", "workers"],
+)
+def test_matches_brute_force(compact: bool, workers: int):
+    # Starting a process pool for every board is slow, a few boards are enough
+    # to check the parallel path
+    boards = BOARDS[:12] if workers > 1 else BOARDS
+
+    for rows in boards:
+        board = load(rows)
+        answers = (
+            part1(board, compact=compact),
+            part2(board, workers=workers, compact=compact),
+        )
+        assert answers == brute_force(rows), rows
+
+
+def test_example():
+    assert (part1(load(EXAMPLE)), part2(load(EXAMPLE))) == (41, 6)
@@ -1,25 +1,80 @@
+import argparse
 import sys
+from contextlib import nullcontext
+from mmap import mmap
 
-from aoc_2024.vector import Vector
+import numpy as np
+from aoc_2024.cache import load_input
+from aoc_2024.measure import traced, tracing
 
-from .solution import Robot, part1, part2
+from .solution import DIM_X, DIM_Y, BathroomGrid, Robots, part1, part2
+
+
+@traced
+def parse_input(lines: list[str]) -> Robots:
+    robots: list[tuple[int, int, int, int]] = []
+    for line in lines:
+        pos_str, vel_str = line.split(" ")
+        pos_x, pos_y = pos_str.removeprefix("p=").split(",")
+        vel_x, vel_y = vel_str.removeprefix("v=").split(",")
+
+        robots.append((int(pos_x), int(pos_y), int(vel_x), int(vel_y)))
+
+    return np.array(robots, dtype=np.int64).reshape(-1, 4)
+
+
+def encode_input(data: bytes | mmap) -> bytes:
+    """Position and velocity of every robot as four 64-bit ints"""
+
+    return parse_input(data[:].decode().splitlines()).tobytes()
+
+
+def decode_input(data: memoryview) -> Robots:
+    return np.frombuffer(data, dtype=np.int64).reshape(-1, 4)
+
+
+def encode_frames(data: bytes | mmap) -> bytes:
+    """Every frame of a period, to scrub through without simulating"""
+
+    # Only the viewer needs the frames
+    from .frames import FrameIndex
+
+    robots = parse_input(data[:].decode().splitlines())
+    return FrameIndex.build(BathroomGrid(robots, DIM_X, DIM_Y)).tobytes()
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--interactive",
+        action="store_true",
+        help="scrub through the grid from the tree on, s and b to move a period of x, "
+        "a step number to jump to it and q to quit",
+    )
+    parser.add_argument(
+        "--half-blocks",
+        action="store_true",
+        help="draw two rows of the grid per line of the terminal when interactive",
+    )
+    parser.add_argument(
+        "--trace",
+        help="trace where the time goes and save it as a Chrome trace to this file",
+    )
+    args = parser.parse_args()
+
     day_str = sys.argv[0].split("/")[-1]
     print(f"Hello from {day_str}!")
 
-    robots: list[Robot] = []
-    with open(f"inputs/{day_str}.txt", "r") as file:
-        lines = file.readlines()
-        for line in lines:
-            pos_str, vel_str = line.split(" ")
-            pos_x, pos_y = pos_str.removeprefix("p=").split(",")
-            vel_x, vel_y = vel_str.removeprefix("v=").split(",")
+    with tracing(args.trace) if args.trace else nullcontext():
+        path = f"inputs/{day_str}.txt"
+        robots = decode_input(load_input(path, encode_input))
+
+        print(part1(robots))
+        step = part2(robots)
+        print(step)
 
-            robots.append(
-                Robot(Vector(int(pos_x), int(pos_y)), Vector(int(vel_x), int(vel_y)))
-            )
+    if args.interactive:
+        from .frames import FrameIndex, view
 
-    print(part1(robots))
-    part2(robots)
+        frames = FrameIndex.from_buffer(load_input(path, encode_frames, "frames"))
+        view(frames, step, half_blocks=args.half_blocks)
@@ -0,0 +1,124 @@
+import math
+
+import numpy as np
+import numpy.typing as npt
+from aoc_2024.measure import traced
+
+from .solution import BathroomGrid, Tile
+from .terminal import TerminalRenderer
+
+# Width and height of the grid ahead of the frames in the binary form
+HEADER = np.dtype([("dim_x", "<i8"), ("dim_y", "<i8")])
+
+
+class FrameIndex:
+    """Which cells hold a robot at every step of one full period, after which
+    the robots are back where they started. Every row of a frame is packed into
+    bits, the lowest bit of a byte first, so the whole period of a 101x103 grid
+    takes 14 MB and can be memory mapped"""
+
+    frames: npt.NDArray[np.uint8]
+    dim_x: int
+    dim_y: int
+    period: int
+
+    def __init__(self, frames: npt.NDArray[np.uint8], dim_x: int, dim_y: int):
+        self.frames = frames
+        self.dim_x = dim_x
+        self.dim_y = dim_y
+        self.period = math.lcm(dim_x, dim_y)
+
+    @classmethod
+    @traced
+    def build(cls, bathroom: BathroomGrid, batch: int = 512) -> "FrameIndex":
+        """Frames for every step from now until the robots are back, simulated
+        batch steps at a time"""
+
+        dim_x, dim_y = bathroom.dim_x, bathroom.dim_y
+        period = math.lcm(dim_x, dim_y)
+        frames = np.empty((period, dim_y, (dim_x + 7) // 8), dtype=np.uint8)
+
+        for start in range(0, period, batch):
+            steps = np.arange(start, min(start + batch, period))
+            positions = bathroom.positions_at(steps)
+
+            occupied = np.zeros((len(steps), dim_y, dim_x), dtype=np.bool_)
+            frame = np.arange(len(steps))[:, None]
+            occupied[frame, positions[..., 1], positions[..., 0]] = True
+            frames[steps] = np.packbits(occupied, axis=-1, bitorder="little")
+
+        return cls(frames, dim_x, dim_y)
+
+    @classmethod
+    def from_buffer(cls, data: memoryview) -> "FrameIndex":
+        """Frames read straight out of their binary form, without copying"""
+
+        header = np.frombuffer(data, dtype=HEADER, count=1)[0]
+        dim_x, dim_y = int(header["dim_x"]), int(header["dim_y"])
+
+        frames = np.frombuffer(data, dtype=np.uint8, offset=HEADER.itemsize)
+        return cls(frames.reshape(-1, dim_y, (dim_x + 7) // 8), dim_x, dim_y)
+
+    def tobytes(self) -> bytes:
+        header = np.array([(self.dim_x, self.dim_y)], dtype=HEADER)
+        return header.tobytes() + self.frames.tobytes()
+
+    def __len__(self) -> int:
+        return self.period
+
+    def frame(self, step: int) -> npt.NDArray[np.bool_]:
+        """Which cells hold a robot after step steps, as a (dim_y, dim_x) array"""
+
+        bits = self.frames[step % self.period]
+        return np.unpackbits(bits, axis=-1, count=self.dim_x, bitorder="little").view(
+            np.bool_
+        )
+
+    def render(self, step: int) -> str:
+        screen = np.full((self.dim_y, self.dim_x + 1), ord(Tile.EMPTY.value), np.uint8)
+        screen[:, -1] = ord("\n")
+        screen[:, :-1][self.frame(step)] = ord(Tile.GUARD.value)
+
+        return screen.tobytes().decode()
+
+    @traced
+    def occupancy(self, x0: int, y0: int, x1: int, y1: int) -> npt.NDArray[np.int64]:
+        """How many cells of the region from (x0, y0) up to but not including
+        (x1, y1) hold a robot at every step of the period. Only counts the bits
+        of the bytes the region covers, without simulating anything"""
+
+        columns = np.zeros(self.dim_x, dtype=np.bool_)
+        columns[x0:x1] = True
+        mask = np.packbits(columns, bitorder="little")
+
+        first, last = x0 // 8, (x1 + 7) // 8
+        region = self.frames[:, y0:y1, first:last] & mask[first:last]
+        return np.bitwise_count(region).sum(axis=(1, 2), dtype=np.int64)
+
+    def steps_over(self, x0: int, y0: int, x1: int, y1: int, n: int) -> list[int]:
+        """Steps of the period where more than n cells of the region hold a
+        robot"""
+
+        return np.flatnonzero(self.occupancy(x0, y0, x1, y1) > n).tolist()
+
+
+def view(frames: FrameIndex, step: int, half_blocks: bool = False):
+    """Show the grid from step on. s and b move a period of x forward and back,
+    a number jumps to that step and q quits"""
+
+    with TerminalRenderer(frames.dim_x, frames.dim_y, half_blocks) as screen:
+        while True:
+            step %= frames.period
+            screen.draw(frames.frame(step), f"Current step: {step} > ")
+
+            command = input()
+            if command == "q":
+                break
+            elif command == "s":
+                step += frames.dim_x
+            elif command == "b":
+                step -= frames.dim_x
+            elif command.isdigit():
+                step = int(command)
+
+    print("Exitting!")
@@ -1,13 +1,16 @@
+import math
 from enum import Enum
-from functools import reduce
-from typing import NamedTuple, override
+from typing import override
 
-from aoc_2024.vector import Vector
+import numpy as np
+import numpy.typing as npt
+from aoc_2024.measure import traced
 
+# Every robot as a row of x, y, velocity x and velocity y
+Robots = npt.NDArray[np.int64]
 
-class Robot(NamedTuple):
-    pos: Vector
-    vel: Vector
+DIM_X = 101
+DIM_Y = 103
 
 
 class Tile(Enum):
@@ -15,104 +18,157 @@ class Tile(Enum):
     EMPTY = "."
 
 
-def calculate_position(robot: Robot, steps: int, grid_x: int, grid_y: int) -> Robot:
-    pos, vel = robot
-    new_x = (pos.x + vel.x * steps) % grid_x
-    new_y = (pos.y + vel.y * steps) % grid_y
+def region_bins(dim: int, n: int) -> npt.NDArray[np.int64]:
+    """Region of each of dim cells along an axis cut into n equal parts. A cell
+    that a cut runs through belongs to neither part, like the robots on the
+    middle lines between quadrants, and gets n"""
 
-    return Robot(Vector(new_x, new_y), Vector(vel.x, vel.y))
+    cells = np.arange(dim)
+    region = cells * n // dim
+    return np.where((cells + 1) * n > (region + 1) * dim, n, region)
 
 
-def sum_quadrants(
-    robots: list[Robot], grid_x: int, grid_y: int
-) -> tuple[int, int, int, int]:
-    mid_x = grid_x // 2
-    mid_y = grid_y // 2
-    tl, tr, bl, br = 0, 0, 0, 0
-    for robot in robots:
-        if 0 <= robot.pos.x < mid_x and 0 <= robot.pos.y < mid_y:
-            tl += 1
-        if 0 <= robot.pos.x < mid_x and mid_y + 1 <= robot.pos.y < grid_y:
-            tr += 1
-        if mid_x + 1 <= robot.pos.x < grid_x and 0 <= robot.pos.y < mid_y:
-            bl += 1
-        if mid_x + 1 <= robot.pos.x < grid_x and mid_y + 1 <= robot.pos.y < grid_y:
-            br += 1
+@traced
+def region_counts(
+    positions: npt.NDArray[np.int64], grid_x: int, grid_y: int, nx: int = 2, ny: int = 2
+) -> npt.NDArray[np.int64]:
+    """Robots in every region of the grid cut into ny rows of nx regions, from
+    a single bincount over the region of each robot. positions can hold any
+    number of steps as a (..., robots, 2) array, the counts come out as
+    (..., ny, nx)"""
 
-    return (tl, tr, bl, br)
+    steps = positions.shape[:-2]
+    n_steps = math.prod(steps)
+    size = (ny + 1) * (nx + 1)
+
+    # Robots between regions are counted in an extra row and column, which are
+    # dropped at the end
+    column = region_bins(grid_x, nx)[positions[..., 0]]
+    row = region_bins(grid_y, ny)[positions[..., 1]]
+    index = (row * (nx + 1) + column).reshape(n_steps, -1)
+    index += np.arange(n_steps)[:, None] * size
+
+    counts = np.bincount(index.ravel(), minlength=n_steps * size)
+    return counts.reshape(*steps, ny + 1, nx + 1)[..., :ny, :nx]
+
+
+def safety_factor(counts: npt.NDArray[np.int64]) -> npt.NDArray[np.object_]:
+    """Product of the robots in every region, for each step of region_counts.
+    Multiplied as Python ints, which int64 would overflow for large crowds"""
+
+    return counts.astype(object).prod(axis=(-2, -1))
+
+
+def entropy(counts: npt.NDArray[np.int64]) -> npt.NDArray[np.float64]:
+    """Shannon entropy in bits of how the robots spread over the regions, for
+    each step of region_counts. It drops when they bunch up"""
+
+    p = counts / np.maximum(counts.sum(axis=(-2, -1), keepdims=True), 1)
+    terms = np.zeros_like(p)
+    np.log2(p, out=terms, where=p > 0)
+    return -(p * terms).sum(axis=(-2, -1))
 
 
 class BathroomGrid:
-    robots: list[Robot]
+    pos: npt.NDArray[np.int64]
+    vel: npt.NDArray[np.int64]
     dim_x: int
     dim_y: int
+    dims: npt.NDArray[np.int64]
 
-    def __init__(self, robots: list[Robot], x: int, y: int):
-        self.robots = robots
+    def __init__(self, robots: Robots, x: int, y: int):
+        self.pos = robots[:, :2] % [x, y]
+        self.vel = robots[:, 2:]
         self.dim_x = x
         self.dim_y = y
+        self.dims = np.array([x, y], dtype=np.int64)
 
     @override
     def __str__(self) -> str:
-        screen: list[list[str]] = [
-            list((Tile.EMPTY.value for _ in range(self.dim_x)))
-            for _ in range(self.dim_y)
-        ]
-
-        for robot in self.robots:
-            screen[robot.pos.y][robot.pos.x] = Tile.GUARD.value
-
-        screen_str = ""
-        for row in screen:
-            screen_str += f"{''.join(row)}\n"
+        screen = np.full((self.dim_y, self.dim_x + 1), ord(Tile.EMPTY.value), np.uint8)
+        screen[:, -1] = ord("\n")
+        screen[self.pos[:, 1], self.pos[:, 0]] = ord(Tile.GUARD.value)
+
+        return screen.tobytes().decode()
+
+    def positions_after(self, steps: int) -> npt.NDArray[np.int64]:
+        return (self.pos + self.vel * steps) % self.dims
+
+    def positions_at(self, steps: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """Positions of every robot after each of steps from now, as a (steps,
+        robots, 2) array computed in one go"""
+
+        steps = np.asarray(steps, dtype=np.int64)
+        return (self.pos + self.vel * steps[:, None, None]) % self.dims
+
+    def axis_variance(self, axis: int) -> npt.NDArray[np.float64]:
+        """Variance of one coordinate of the robots at every step of that
+        axis' period. Robots that start on the same line with the same
+        velocity modulo the size of the axis move together, so they're counted
+        into at most size x size groups and only the groups are stepped. That
+        keeps the work and memory the same however many robots there are"""
+
+        size = int(self.dims[axis])
+        groups = np.bincount(
+            self.pos[:, axis] * size + self.vel[:, axis] % size, minlength=size * size
+        )
+        group = np.flatnonzero(groups)
+        weight = groups[group]
+        start, vel = np.divmod(group, size)
+
+        # Every group's position at every step, as (steps, groups)
+        positions = (start + vel * np.arange(size)[:, None]) % size
+        n = weight.sum()
+        mean = positions @ weight / n
+        return (positions * positions) @ weight / n - mean * mean
+
+    @traced
+    def region_counts_at(
+        self, steps: npt.ArrayLike, nx: int, ny: int, batch: int = 512
+    ) -> npt.NDArray[np.int64]:
+        """region_counts after each of steps from now, as (steps, ny, nx). The
+        positions are only worked out batch steps at a time, so a whole period
+        fits in memory"""
+
+        steps = np.asarray(steps, dtype=np.int64)
+        counts = np.empty((len(steps), ny, nx), dtype=np.int64)
+        for start in range(0, len(steps), batch):
+            positions = self.positions_at(steps[start : start + batch])
+            counts[start : start + batch] = region_counts(
+                positions, self.dim_x, self.dim_y, nx, ny
+            )
 
-        return screen_str
+        return counts
 
+    @traced
     def step(self, steps: int):
-        updated_robots: list[Robot] = []
-        for robot in self.robots:
-            updated_robots.append(
-                calculate_position(robot, steps, grid_x=101, grid_y=103)
-            )
-
-        self.robots = updated_robots
+        self.pos = self.positions_after(steps)
 
 
-def part1(robots: list[Robot]) -> int:
-    dim_x = 101
-    dim_y = 103
-    bathroom = BathroomGrid(robots, dim_x, dim_y)
+@traced
+def part1(robots: Robots) -> int:
+    bathroom = BathroomGrid(robots, DIM_X, DIM_Y)
     bathroom.step(100)
 
-    quadrants = sum_quadrants(bathroom.robots, grid_x=101, grid_y=103)
-    return reduce(lambda x, y: x * y, quadrants)
-
+    return int(safety_factor(region_counts(bathroom.pos, DIM_X, DIM_Y)))
 
-def move_cursor_up(lines: int):
-    print(f"\033[{lines}A", end="")
-    print("\033[J", end="")
 
+@traced
+def find_tree(bathroom: BathroomGrid) -> int:
+    """First step where the robots draw the tree. x positions repeat every
+    dim_x steps and y positions every dim_y steps, and the robots bunch up on
+    each axis when the tree shows. So the step with the least spread in x is
+    found within one period of x, the same for y, and the Chinese remainder
+    theorem combines the two"""
 
-def part2(robots: list[Robot]) -> None:
-    dim_x = 101
-    dim_y = 103
-    bathroom = BathroomGrid(robots, dim_x, dim_y)
-    step = 18
+    step_x = int(bathroom.axis_variance(0).argmin())
+    step_y = int(bathroom.axis_variance(1).argmin())
 
-    bathroom.step(18)
-    print(f"Current step: {step}")
-    print(str(bathroom))
-    step += dim_x
+    # The step is step_x plus some number of x periods, picked so it also
+    # lands on step_y modulo dim_y
+    periods = (step_y - step_x) * pow(bathroom.dim_x, -1, bathroom.dim_y)
+    return step_x + bathroom.dim_x * (periods % bathroom.dim_y)
 
-    while True:
-        command = input()
 
-        if command == "q":
-            print("Exitting!")
-            break
-        elif command == "s":
-            bathroom.step(dim_x)
-            move_cursor_up(dim_y + 3)
-            print(f"Current step: {step}")
-            print(str(bathroom))
-            step += dim_x
+def part2(robots: Robots) -> int:
+    return find_tree(BathroomGrid(robots, DIM_X, DIM_Y))
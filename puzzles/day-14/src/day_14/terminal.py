@@ -0,0 +1,113 @@
+import sys
+from types import TracebackType
+from typing import IO, Self
+
+import numpy as np
+import numpy.typing as npt
+from aoc_2024.measure import traced
+
+from .solution import Tile
+
+# What each cell code looks like. With half blocks a code holds the top robot
+# in its lowest bit and the bottom one in the next
+GLYPHS = [Tile.EMPTY.value.encode(), Tile.GUARD.value.encode()]
+HALF_BLOCK_GLYPHS = [" ".encode(), "▀".encode(), "▄".encode(), "█".encode()]
+
+# Any code no glyph has, so the first frame draws every cell
+UNDRAWN = 255
+
+ALTERNATE_SCREEN = b"\033[?1049h\033[H\033[2J"
+MAIN_SCREEN = b"\033[?1049l"
+
+
+class TerminalRenderer:
+    """Draws frames of the grid in place on the terminal's alternate screen.
+    The cells on screen are kept in a framebuffer, so every frame only moves
+    the cursor to and redraws the cells that changed since the last one, in a
+    single write. The grid sits below a one line header, and the cursor is
+    left at the end of the header so typed input never scrolls the screen"""
+
+    dim_x: int
+    dim_y: int
+    half_blocks: bool
+    glyphs: list[bytes]
+    out: IO[bytes]
+
+    framebuffer: bytearray
+    cells: npt.NDArray[np.uint8]
+
+    def __init__(
+        self,
+        dim_x: int,
+        dim_y: int,
+        half_blocks: bool = False,
+        out: IO[bytes] | None = None,
+    ) -> None:
+        self.dim_x = dim_x
+        self.dim_y = dim_y
+        self.half_blocks = half_blocks
+        self.glyphs = HALF_BLOCK_GLYPHS if half_blocks else GLYPHS
+        self.out = out if out is not None else sys.stdout.buffer
+
+        # Two rows of the grid share a line of the screen with half blocks
+        rows = (dim_y + 1) // 2 if half_blocks else dim_y
+        self.framebuffer = bytearray([UNDRAWN]) * (rows * dim_x)
+        self.cells = np.frombuffer(self.framebuffer, dtype=np.uint8).reshape(
+            rows, dim_x
+        )
+
+    def codes(self, occupied: npt.NDArray[np.bool_]) -> npt.NDArray[np.uint8]:
+        """Cell codes of a (dim_y, dim_x) occupancy grid as it goes on screen"""
+
+        if not self.half_blocks:
+            return occupied.view(np.uint8)
+
+        top = occupied[0::2].view(np.uint8)
+        bottom = np.zeros_like(top)
+        bottom[: self.dim_y // 2] = occupied[1::2]
+        bottom <<= 1
+        return top | bottom
+
+    @traced
+    def draw(self, occupied: npt.NDArray[np.bool_], header: str):
+        codes = self.codes(occupied)
+        changed = np.flatnonzero(codes != self.cells)
+        new_codes = codes.ravel()[changed]
+        self.cells.ravel()[changed] = new_codes
+
+        # Looping over Python ints is far faster than over NumPy scalars
+        changed_cells: list[int] = changed.tolist()
+        changed_codes: list[int] = new_codes.tolist()
+
+        frame = bytearray()
+        last = -1
+        for cell, code in zip(changed_cells, changed_codes):
+            # Writing a glyph moves the cursor on by one, so a run of changed
+            # cells along a line only needs the cursor moved to its start
+            if cell != last + 1 or cell % self.dim_x == 0:
+                row, column = divmod(cell, self.dim_x)
+                frame += b"\033[%d;%dH" % (row + 2, column + 1)
+            frame += self.glyphs[code]
+            last = cell
+
+        frame += b"\033[1;1H\033[2K" + header.encode()
+        self.out.write(frame)
+        self.out.flush()
+
+    def close(self):
+        self.out.write(MAIN_SCREEN)
+        self.out.flush()
+
+    def __enter__(self) -> Self:
+        # Anything printed so far has to be out before the screen is switched
+        sys.stdout.flush()
+        self.out.write(ALTERNATE_SCREEN)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+from day_14.solution import (
+    DIM_X,
+    DIM_Y,
+    BathroomGrid,
+    part1,
+    region_counts,
+    safety_factor,
+)
+
+
+def brute_force(
+    positions: npt.NDArray[np.int64], grid_x: int, grid_y: int, nx: int, ny: int
+) -> list[list[int]]:
+    """Count every robot in the region its cell lies wholly inside, if any,
+    with each region spanning an equal share of the grid"""
+
+    counts = [[0] * nx for _ in range(ny)]
+    for x, y in positions.tolist():
+        columns = [
+            i
+            for i in range(nx)
+            if i * grid_x <= x * nx < (x + 1) * nx <= (i + 1) * grid_x
+        ]
+        rows = [
+            j
+            for j in range(ny)
+            if j * grid_y <= y * ny < (y + 1) * ny <= (j + 1) * grid_y
+        ]
+        if columns and rows:
+            counts[rows[0]][columns[0]] += 1
+
+    return counts
+
+
+@pytest.mark.parametrize(("grid_x", "grid_y"), [(101, 103), (11, 7), (10, 8), (12, 9)])
+@pytest.mark.parametrize(("nx", "ny"), [(1, 1), (2, 2), (3, 4), (5, 1), (4, 3)])
+def test_matches_brute_force(grid_x: int, grid_y: int, nx: int, ny: int):
+    rng = np.random.default_rng(grid_x * grid_y + nx * 10 + ny)
+    positions = rng.integers(0, [grid_x, grid_y], size=(300, 2))
+
+    counts = region_counts(positions, grid_x, grid_y, nx, ny)
+    assert counts.tolist() == brute_force(positions, grid_x, grid_y, nx, ny)
+
+
+def test_counts_each_step_apart():
+    rng = np.random.default_rng(0)
+    positions = rng.integers(0, [DIM_X, DIM_Y], size=(5, 200, 2))
+
+    counts = region_counts(positions, DIM_X, DIM_Y, 3, 4)
+    for step, step_positions in enumerate(positions):
+        assert counts[step].tolist() == brute_force(step_positions, DIM_X, DIM_Y, 3, 4)
+
+
+def test_part1_matches_quadrant_sums():
+    rng = np.random.default_rng(1)
+    robots = np.concatenate(
+        [
+            rng.integers(0, [DIM_X, DIM_Y], size=(500, 2)),
+            rng.integers(-100, 101, size=(500, 2)),
+        ],
+        axis=1,
+    )
+
+    bathroom = BathroomGrid(robots, DIM_X, DIM_Y)
+    bathroom.step(100)
+    mid_x, mid_y = DIM_X // 2, DIM_Y // 2
+    x, y = bathroom.pos[:, 0].tolist(), bathroom.pos[:, 1].tolist()
+
+    # The puzzle's own rule, robots on either middle line count for nothing
+    quadrants = [0, 0, 0, 0]
+    for rx, ry in zip(x, y):
+        if rx != mid_x and ry != mid_y:
+            quadrants[(rx > mid_x) * 2 + (ry > mid_y)] += 1
+
+    assert part1(robots) == math.prod(quadrants)
+    assert safety_factor(region_counts(bathroom.pos, DIM_X, DIM_Y)) == math.prod(
+        quadrants
+    )
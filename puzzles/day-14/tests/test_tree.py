@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from day_14.solution import DIM_X, DIM_Y, BathroomGrid, Robots, part2
+
+
+def plant_tree(rng: np.random.Generator, step: int) -> Robots:
+    """Robots that all stand in a small box after step steps, with as many
+    scattered around the grid at random"""
+
+    velocities = rng.integers(-100, 101, size=(500, 2))
+    tree = np.stack([rng.integers(40, 60, 300), rng.integers(40, 70, 300)], axis=1)
+    scattered = np.stack([rng.integers(0, DIM_X, 200), rng.integers(0, DIM_Y, 200)], 1)
+
+    positions = np.concatenate([tree, scattered]) - velocities * step
+    return np.hstack([positions % [DIM_X, DIM_Y], velocities]).astype(np.int64)
+
+
+@pytest.mark.parametrize("step", [0, 1, 100, 102, 6577, 7502, 10402])
+def test_finds_planted_tree(step: int):
+    rng = np.random.default_rng(step)
+    assert part2(plant_tree(rng, step)) == step
+
+
+@pytest.mark.parametrize("axis", [0, 1])
+def test_axis_variance_matches_numpy(axis: int):
+    rng = np.random.default_rng(axis)
+    robots = np.concatenate(
+        [
+            rng.integers(0, [DIM_X, DIM_Y], size=(1000, 2)),
+            rng.integers(-1000, 1001, size=(1000, 2)),
+        ],
+        axis=1,
+    )
+    bathroom = BathroomGrid(robots, DIM_X, DIM_Y)
+
+    size = int(bathroom.dims[axis])
+    positions = bathroom.positions_at(range(size))[..., axis]
+    np.testing.assert_allclose(bathroom.axis_variance(axis), np.var(positions, axis=1))
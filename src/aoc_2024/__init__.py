@@ -1,2 +0,0 @@
-def main() -> None:
-    print("Hello from aoc-2024!")
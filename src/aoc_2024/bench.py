@@ -0,0 +1,204 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import statistics
+import sys
+from statistics import NormalDist
+from time import perf_counter
+from typing import Any, Callable, TypedDict
+
+from .runner import import_day, parse_day
+
+
+class Summary(TypedDict):
+    day: int
+    part: int
+    warmup: int
+    repeat: int
+    min: float
+    median: float
+    p95: float
+    mean: float
+    stddev: float
+    times: list[float]
+
+
+def time_runs(
+    func: Callable[..., Any], args: tuple[Any, ...], warmup: int, repeat: int
+) -> list[float]:
+    # Solutions print progress as they go, which would only add noise here
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            func(*args)
+
+        times: list[float] = []
+        for _ in range(repeat):
+            start = perf_counter()
+            func(*args)
+            times.append(perf_counter() - start)
+
+    return times
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * q
+    lo, hi = math.floor(k), math.ceil(k)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(day: int, part: int, times: list[float], warmup: int) -> Summary:
+    return {
+        "day": day,
+        "part": part,
+        "warmup": warmup,
+        "repeat": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "p95": percentile(times, 0.95),
+        "mean": statistics.fmean(times),
+        "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "times": times,
+    }
+
+
+def slower_p_value(baseline: list[float], current: list[float]) -> float:
+    """One sided Mann-Whitney U test for current being slower than baseline.
+    Timings are skewed by outliers, so ranks hold up better than a t-test"""
+
+    n_a, n_b = len(baseline), len(current)
+    combined = sorted([(t, 0) for t in baseline] + [(t, 1) for t in current])
+
+    # Average the ranks of tied timings
+    rank_sum = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        rank_sum += rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 1)
+        i = j + 1
+
+    u = rank_sum - n_b * (n_b + 1) / 2
+    mu = n_a * n_b / 2
+    sigma = math.sqrt(n_a * n_b * (n_a + n_b + 1) / 12)
+    if sigma == 0:
+        return 1.0
+
+    return 1 - NormalDist().cdf((u - mu) / sigma)
+
+
+def is_regression(
+    baseline: Summary, current: Summary, alpha: float = 0.01, threshold: float = 0.1
+) -> bool:
+    """Only a slowdown that is both significant and larger than the threshold
+    counts, so tiny but consistent differences don't fail a comparison"""
+
+    if current["median"] <= baseline["median"] * (1 + threshold):
+        return False
+
+    return slower_p_value(baseline["times"], current["times"]) < alpha
+
+
+def load_day(day: int) -> tuple[Any, Any]:
+    """Import a day's package and parse its input the same way its main does"""
+
+    module = import_day(day)
+    return module, parse_day(module, day)
+
+
+def bench_day(day: int, parts: list[int], warmup: int, repeat: int) -> list[Summary]:
+    module, parsed = load_day(day)
+
+    summaries: list[Summary] = []
+    for part in parts:
+        func = getattr(module, f"part{part}")
+        # Skip the @measure wrapper, its printing would only add to every run
+        func = getattr(func, "__wrapped__", func)
+
+        times = time_runs(func, (parsed,), warmup, repeat)
+        summaries.append(summarize(day, part, times, warmup))
+
+    return summaries
+
+
+def format_summary(summary: Summary) -> str:
+    return (
+        f"day {summary['day']:02d} part {summary['part']}: "
+        f"min {summary['min'] * 1e3:.3f} ms, "
+        f"median {summary['median'] * 1e3:.3f} ms, "
+        f"p95 {summary['p95'] * 1e3:.3f} ms, "
+        f"stddev {summary['stddev'] * 1e3:.3f} ms "
+        f"({summary['repeat']} runs)"
+    )
+
+
+def compare(
+    baseline: list[Summary], current: list[Summary], threshold: float = 0.1
+) -> bool:
+    """Print how each result moved against the baseline, returns whether any of
+    them regressed"""
+
+    by_key = {(s["day"], s["part"]): s for s in baseline}
+
+    regressed = False
+    for summary in current:
+        base = by_key.get((summary["day"], summary["part"]))
+        if base is None:
+            print(f"day {summary['day']:02d} part {summary['part']}: no baseline")
+            continue
+
+        change = summary["median"] / base["median"] - 1
+        status = "ok"
+        if is_regression(base, summary, threshold=threshold):
+            status = "REGRESSION"
+            regressed = True
+
+        print(
+            f"day {summary['day']:02d} part {summary['part']}: "
+            f"median {base['median'] * 1e3:.3f} ms -> {summary['median'] * 1e3:.3f} ms "
+            f"({change:+.1%}) {status}"
+        )
+
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark solutions")
+    parser.add_argument("days", type=int, nargs="+")
+    parser.add_argument("--part", type=int, action="append", choices=[1, 2])
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to check against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="smallest relative slowdown of the median that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    results: list[Summary] = []
+    for day in args.days:
+        for summary in bench_day(day, args.part or [1, 2], args.warmup, args.repeat):
+            print(format_summary(summary))
+            results.append(summary)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline: list[Summary] = json.load(file)
+
+        if compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import mmap
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+CACHE_DIR = Path(".cache")
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write data to a temporary file next to path and rename it over path, so
+    a crash or another process or thread never sees half a file. Every writer
+    gets its own temporary file"""
+
+    # Only needed on a cache miss, and slow to import
+    import tempfile
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def load_input(
+    path: str, encode: Callable[[bytes | mmap.mmap], bytes], kind: str = "inputs"
+) -> memoryview:
+    """Binary form of a text input, made by encode the first time and memory
+    mapped from the cache after that. The cache is keyed by a hash of the text
+    and of the source of encode's module, so editing either rebuilds it. Each
+    kind of binary form is cached apart, so one input can have several. encode
+    gets the text memory mapped, so an encoder that reads it a chunk at a time
+    never holds all of it in memory"""
+
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            data = b""
+        else:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    name = Path(path).stem
+    digest = hashlib.sha256(data)
+
+    # A changed encoder may write a different binary form of the same text
+    source = getattr(sys.modules.get(encode.__module__), "__file__", None)
+    if source is not None:
+        digest.update(Path(source).read_bytes())
+
+    cache_dir = CACHE_DIR / kind
+    cache_path = cache_dir / f"{name}-{digest.hexdigest()[:16]}.bin"
+
+    if not cache_path.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in cache_dir.glob(f"{name}-*.bin"):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+
+        write_atomic(cache_path, encode(data))
+
+    if isinstance(data, mmap.mmap):
+        data.close()
+
+    with open(cache_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:  # Empty files can't be mapped
+            return memoryview(b"")
+
+        # The mapping stays open for as long as a view of it is alive
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class AnswerCache:
+    """Answers stored on disk under a hash of the input, the source of the
+    day's package and the part, so a rerun with nothing changed is a lookup.
+    Least recently used answers are evicted once the cache outgrows max_bytes"""
+
+    path: Path
+    max_bytes: int
+
+    def __init__(self, path: Path = CACHE_DIR / "answers", max_bytes: int = 1 << 20):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def key(self, input_data: bytes, module: ModuleType, part: int) -> str:
+        digest = hashlib.sha256(input_data)
+
+        assert module.__file__ is not None
+        for source in sorted(Path(module.__file__).parent.rglob("*.py")):
+            digest.update(source.read_bytes())
+
+        digest.update(str(part).encode())
+        return digest.hexdigest()
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self.path / f"{key}.json"
+        try:
+            with open(entry, "r") as file:
+                answer = json.load(file)["answer"]
+        except (OSError, ValueError, KeyError):
+            raise KeyError(key)
+
+        # The modification time doubles as the last use for eviction
+        entry.touch()
+        return answer
+
+    def __setitem__(self, key: str, answer: Any):
+        try:
+            data = json.dumps({"answer": answer})
+        except TypeError:  # Answers that don't fit in JSON are not cached
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path / f"{key}.json", data.encode())
+
+        self.evict()
+
+    def evict(self):
+        entries: list[tuple[Path, os.stat_result]] = []
+        for entry in self.path.glob("*.json"):
+            try:
+                entries.append((entry, entry.stat()))
+            except FileNotFoundError:  # Evicted by another process meanwhile
+                continue
+
+        entries.sort(key=lambda item: item[1].st_mtime)
+
+        size = sum(stat.st_size for _, stat in entries)
+        for entry, stat in entries:
+            if size <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            size -= stat.st_size
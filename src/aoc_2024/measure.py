@@ -1,6 +1,15 @@
-from time import perf_counter
+from collections.abc import Generator
+from contextlib import AbstractContextManager, contextmanager
+from functools import wraps
+import os
+import sys
+import threading
+from time import perf_counter, perf_counter_ns
 import tracemalloc
-from typing import Callable, ParamSpec, TypeVar
+from typing import Any, Callable, NamedTuple, ParamSpec, TypeVar, overload
+
+P = ParamSpec("P")
+R = TypeVar("R")
 
 
 def format_time(seconds: float) -> tuple[float, str]:
@@ -17,37 +26,408 @@ def format_time(seconds: float) -> tuple[float, str]:
 
 
 def format_memory(bytes: int) -> tuple[float, str]:
-    if bytes < 1024**2:  # Less than 1 KiB
+    if bytes < 1024:  # Less than 1 KiB
         return bytes, "bytes"
-    elif bytes < 1024**3:  # Less than 1 MiB
+    elif bytes < 1024**2:  # Less than 1 MiB
         return bytes / 1024, "KiB"
-    elif bytes < 1024**4:  # Less than 1 GiB
-        return bytes / 1024**3, "MiB"
+    elif bytes < 1024**3:  # Less than 1 GiB
+        return bytes / 1024**2, "MiB"
     else:
-        return bytes / 1024**4, "GiB"
+        return bytes / 1024**3, "GiB"
 
 
-P = ParamSpec("P")
-R = TypeVar("R")
+def max_rss() -> int | None:
+    """High-water mark of the whole process' resident memory in bytes"""
+
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+# Whether measured functions run a second time to trace their memory, only
+# inside a memory_tracing block
+_memory_tracing = False
+
+
+class SpanRecord(NamedTuple):
+    name: str
+    start: int
+    duration: int
+    self_time: int
+    thread: int
+    depth: int
+
+
+# Finished spans, None while tracing is off so every span is a single check
+_records: list[SpanRecord] | None = None
+_local = threading.local()
+
+
+def _stack() -> list["_Span"]:
+    try:
+        stack: list[_Span] = _local.stack
+    except AttributeError:
+        stack = _local.stack = []
+    return stack
+
+
+class _Span:
+    __slots__ = ("name", "start", "child_time")
+
+    name: str
+    start: int
+    child_time: int
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.child_time = 0
+        _stack().append(self)
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        duration = perf_counter_ns() - self.start
+
+        stack = _stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_time += duration
+
+        records = _records
+        if records is not None:
+            records.append(
+                SpanRecord(
+                    self.name,
+                    self.start,
+                    duration,
+                    duration - self.child_time,
+                    threading.get_ident(),
+                    len(stack),
+                )
+            )
+
+
+class _NoSpan:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: object) -> None:
+        return None
 
 
-def measure(func: Callable[P, R]) -> Callable[P, R]:
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str) -> AbstractContextManager[object]:
+    """Record the time spent in a block as a span, nested spans are tracked per
+    thread. Does nothing while tracing is off"""
+
+    if _records is None:
+        return _NO_SPAN
+    return _Span(name)
+
+
+def traced(func: Callable[P, R]) -> Callable[P, R]:
+    name = func.__qualname__
+
+    @wraps(func)
     def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-        tracemalloc.start()
-        start = perf_counter()
+        if _records is None:
+            return func(*args, **kwargs)
+
+        with _Span(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def start_tracing():
+    global _records
+    _records = []
+
+
+def stop_tracing() -> list[SpanRecord]:
+    global _records
+    records, _records = _records or [], None
+    return records
+
+
+def write_chrome_trace(path: str, records: list[SpanRecord]):
+    """Save spans in the trace event format that chrome://tracing and Perfetto
+    open"""
+
+    import json
+
+    events: list[dict[str, Any]] = [
+        {
+            "name": record.name,
+            "ph": "X",
+            "ts": record.start / 1000,
+            "dur": record.duration / 1000,
+            "pid": os.getpid(),
+            "tid": record.thread,
+            "args": {"self_us": record.self_time / 1000},
+        }
+        for record in records
+    ]
+
+    with open(path, "w") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+def print_span_table(records: list[SpanRecord]):
+    totals: dict[str, list[int]] = {}
+    for record in records:
+        calls_total_self = totals.setdefault(record.name, [0, 0, 0])
+        calls_total_self[0] += 1
+        calls_total_self[1] += record.duration
+        calls_total_self[2] += record.self_time
+
+    width = max((len(name) for name in totals), default=4)
+    print(f"{'span':<{width}}  {'calls':>8}  {'total ms':>10}  {'self ms':>10}")
+    for name, (calls, total, self_time) in sorted(
+        totals.items(), key=lambda item: item[1][2], reverse=True
+    ):
+        print(
+            f"{name:<{width}}  {calls:>8}  {total / 1e6:>10.3f}  {self_time / 1e6:>10.3f}"
+        )
+
+
+@contextmanager
+def tracing(path: str | None = None) -> Generator[None, None, None]:
+    """Trace spans for the duration of the block, then print where the time
+    went and optionally save a Chrome trace to path"""
+
+    start_tracing()
+    try:
+        yield
+    finally:
+        records = stop_tracing()
+        if path is not None:
+            write_chrome_trace(path, records)
+        print_span_table(records)
 
-        result = func(*args, **kwargs)
 
-        end = perf_counter()
+class Histogram:
+    """Counts values into power of two buckets so memory stays the same no
+    matter how many values are observed"""
 
-        memory = format_memory(tracemalloc.get_traced_memory()[1])
+    count: int
+    total: int
+    min: int
+    max: int
+    buckets: dict[int, int]
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.min = sys.maxsize
+        self.max = -sys.maxsize
+        self.buckets = {}
+
+    def add(self, value: int):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        bucket = max(value, 0).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+
+# Counters and histograms, None while counting is off so every increment is a
+# single check
+_counts: dict[str, int] | None = None
+_histograms: dict[str, Histogram] | None = None
+
+
+def count(name: str, n: int = 1):
+    counts = _counts
+    if counts is not None:
+        counts[name] = counts.get(name, 0) + n
+
+
+def observe(name: str, value: int):
+    histograms = _histograms
+    if histograms is not None:
+        if name not in histograms:
+            histograms[name] = Histogram()
+        histograms[name].add(value)
+
+
+def start_counting():
+    global _counts, _histograms
+    _counts, _histograms = {}, {}
+
+
+def stop_counting() -> tuple[dict[str, int], dict[str, Histogram]]:
+    global _counts, _histograms
+    result = (_counts or {}, _histograms or {})
+    _counts, _histograms = None, None
+    return result
+
+
+def print_counters(counts: dict[str, int], histograms: dict[str, Histogram]):
+    width = max((len(name) for name in [*counts, *histograms]), default=0)
+    for name, value in counts.items():
+        print(f"{name:<{width}}  {value:>12}")
+
+    for name, histogram in histograms.items():
+        mean = histogram.total / histogram.count
+        print(
+            f"{name:<{width}}  {histogram.count:>12} observed, "
+            f"min {histogram.min}, mean {mean:.1f}, max {histogram.max}"
+        )
+        for bucket, n in sorted(histogram.buckets.items()):
+            low, high = (1 << bucket) >> 1, (1 << bucket) - 1
+            bar = "#" * max(1, round(40 * n / histogram.count))
+            print(f"{'':<{width}}  {f'{low}..{high}':>12} {n:>8} {bar}")
+
+
+@contextmanager
+def counting() -> Generator[None, None, None]:
+    """Collect counters for the duration of the block and print them after"""
+
+    start_counting()
+    try:
+        yield
+    finally:
+        print_counters(*stop_counting())
+
+
+class MemoryBudgetExceeded(Exception):
+    pass
+
+
+class MemoryReport(NamedTuple):
+    peak: int
+    max_rss: int | None
+    top: list[tracemalloc.Statistic]
+
+
+def trace_memory(
+    func: Callable[P, R], top: int, *args: P.args, **kwargs: P.kwargs
+) -> MemoryReport:
+    """Run func again with allocation tracing on, kept apart from the timed run
+    because tracing slows down every allocation"""
+
+    global _records, _counts, _histograms
+
+    # Spans from this run would only show the tracing overhead, and counters
+    # would count everything twice
+    records, _records = _records, None
+    counts, _counts = _counts, None
+    histograms, _histograms = _histograms, None
+
+    tracemalloc.start()
+    try:
+        # Hold on to the result so the snapshot still sees what it allocated
+        result = func(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot() if top > 0 else None
+        del result
+    finally:
         tracemalloc.stop()
+        _records = records
+        _counts, _histograms = counts, histograms
 
-        time_taken = end - start
-        value, unit = format_time(time_taken)
-        print(f"Calculated in {value:.2f} {unit}")
-        print(f"Peak memory used: {memory[0] / 1024:.2f} {memory[1]}")
+    stats: list[tracemalloc.Statistic] = []
+    if snapshot is not None:
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ]
+        )
+        stats = snapshot.statistics("lineno")[:top]
 
-        return result
+    return MemoryReport(peak, max_rss(), stats)
 
-    return wrapper
+
+@contextmanager
+def memory_tracing() -> Generator[None, None, None]:
+    """Run every measured function a second time to trace its memory use, for
+    the duration of the block. Functions with side effects that must not
+    happen twice shouldn't be called inside it"""
+
+    global _memory_tracing
+
+    previous, _memory_tracing = _memory_tracing, True
+    try:
+        yield
+    finally:
+        _memory_tracing = previous
+
+
+@overload
+def measure(func: Callable[P, R], /) -> Callable[P, R]: ...
+
+
+@overload
+def measure(
+    *, memory: bool = False, top: int = 0, budget: int | None = None
+) -> Callable[[Callable[P, R]], Callable[P, R]]: ...
+
+
+def measure(
+    func: Callable[P, R] | None = None,
+    /,
+    *,
+    memory: bool = False,
+    top: int = 0,
+    budget: int | None = None,
+) -> Callable[P, R] | Callable[[Callable[P, R]], Callable[P, R]]:
+    """Time a function and, inside memory_tracing or when memory or budget is
+    given, run it a second time to trace its memory use. top lists the biggest
+    allocation sites and budget fails the call when its peak traced memory goes
+    over that many bytes"""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(func.__qualname__):
+                start = perf_counter()
+                result = func(*args, **kwargs)
+                end = perf_counter()
+
+            value, unit = format_time(end - start)
+            print(f"Calculated in {value:.2f} {unit}")
+
+            if not (memory or budget is not None or _memory_tracing):
+                return result
+
+            report = trace_memory(func, top, *args, **kwargs)
+
+            value, unit = format_memory(report.peak)
+            print(f"Peak memory used: {value:.2f} {unit}")
+            if report.max_rss is not None:
+                value, unit = format_memory(report.max_rss)
+                print(f"Process max RSS: {value:.2f} {unit}")
+
+            for stat in report.top:
+                value, unit = format_memory(stat.size)
+                print(
+                    f"  {value:.2f} {unit} in {stat.count} blocks at {stat.traceback}"
+                )
+
+            if budget is not None and report.peak > budget:
+                raise MemoryBudgetExceeded(
+                    f"{func.__name__} peaked at {report.peak} bytes, "
+                    f"over its budget of {budget} bytes"
+                )
+
+            return result
+
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+
+    return decorator
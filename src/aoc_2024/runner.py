@@ -0,0 +1,297 @@
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import re
+import sys
+from time import perf_counter, thread_time
+from types import ModuleType
+from typing import Any, NamedTuple
+
+from .cache import AnswerCache, load_input
+
+
+class PartResult(NamedTuple):
+    part: int
+    answer: Any
+    seconds: float
+    cache: str
+
+
+class DayResult(NamedTuple):
+    day: int
+    parse: float
+    parts: list[PartResult]
+    total: float
+    cpu: float
+
+
+def discover_days() -> list[int]:
+    """Days with an installed package, found through their day-XX scripts so
+    none of them has to be imported"""
+
+    # Slow to import, and not needed when the days are given
+    from importlib.metadata import entry_points
+
+    days: set[int] = set()
+    for script in entry_points(group="console_scripts"):
+        match = re.fullmatch(r"day-(\d+)", script.name)
+        if match is not None:
+            days.add(int(match[1]))
+
+    return sorted(days)
+
+
+def import_day(day: int) -> ModuleType:
+    # Only the package itself, which keeps heavy dependencies like Pillow
+    # behind the features that need them
+    return importlib.import_module(f"day_{day:02d}")
+
+
+def parse_day(module: ModuleType, day: int) -> Any:
+    """Parse a day's input the way its main does, through the binary input
+    cache when the day knows how to encode it"""
+
+    path = f"inputs/day-{day:02d}.txt"
+
+    encode = getattr(module, "encode_input", None)
+    decode = getattr(module, "decode_input", None)
+    if encode is not None and decode is not None:
+        return decode(load_input(path, encode))
+
+    with open(path, "r") as file:
+        lines = file.readlines()
+
+    parse_input = getattr(module, "parse_input", None)
+    return parse_input(lines) if parse_input is not None else lines
+
+
+def run_day(
+    day: int,
+    parts: list[int],
+    cache: AnswerCache | None = None,
+    refresh: bool = False,
+) -> DayResult:
+    """Solve the parts of a day, looking answers up in cache first unless
+    refresh is set. Solutions print progress as they go, callers decide where
+    that goes"""
+
+    start = perf_counter()
+    cpu_start = thread_time()
+    module = import_day(day)
+
+    keys: dict[int, str] = {}
+    if cache is not None:
+        with open(f"inputs/day-{day:02d}.txt", "rb") as file:
+            input_data = file.read()
+        keys = {part: cache.key(input_data, module, part) for part in parts}
+
+    # Only parsed once some part has to be solved
+    parsed: Any = None
+    parse_time = 0.0
+
+    results: list[PartResult] = []
+    for part in parts:
+        status = "off"
+        if cache is not None:
+            status = "miss"
+
+            if not refresh:
+                lookup_start = perf_counter()
+                try:
+                    answer = cache[keys[part]]
+                except KeyError:
+                    pass
+                else:
+                    seconds = perf_counter() - lookup_start
+                    results.append(PartResult(part, answer, seconds, "hit"))
+                    continue
+
+        if parsed is None:
+            parse_start = perf_counter()
+            parsed = parse_day(module, day)
+            parse_time = perf_counter() - parse_start
+
+        func = getattr(module, f"part{part}")
+        # Skip the @measure wrapper, the runner does its own timing
+        func = getattr(func, "__wrapped__", func)
+
+        part_start = perf_counter()
+        answer = func(parsed)
+        results.append(PartResult(part, answer, perf_counter() - part_start, status))
+
+        if cache is not None:
+            cache[keys[part]] = answer
+
+    return DayResult(
+        day, parse_time, results, perf_counter() - start, thread_time() - cpu_start
+    )
+
+
+def run_day_quietly(
+    day: int,
+    parts: list[int],
+    cache: AnswerCache | None = None,
+    refresh: bool = False,
+) -> DayResult:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_day(day, parts, cache, refresh)
+
+
+def cache_note(part: PartResult) -> str:
+    return "" if part.cache == "off" else f", cache {part.cache}"
+
+
+def print_day(result: DayResult):
+    for part in result.parts:
+        print(
+            f"day {result.day:02d} part {part.part}: {part.answer} "
+            f"({part.seconds * 1e3:.3f} ms{cache_note(part)})"
+        )
+
+    solve = sum(part.seconds for part in result.parts)
+    print(
+        f"day {result.day:02d}: parse {result.parse * 1e3:.3f} ms, "
+        f"solve {solve * 1e3:.3f} ms, total {result.total * 1e3:.3f} ms"
+    )
+
+
+def answer_cache(args: argparse.Namespace) -> AnswerCache | None:
+    return None if args.no_cache else AnswerCache()
+
+
+def run(args: argparse.Namespace) -> bool:
+    """Run the requested days one after another, returns whether all of them
+    could run. A day that fails is reported and the rest still run, like in
+    run_parallel"""
+
+    ok = True
+    for day in args.days or discover_days():
+        try:
+            result = run_day_quietly(
+                day, args.part or [1, 2], answer_cache(args), args.refresh
+            )
+        except Exception as e:
+            print(f"day {day:02d}: failed, {e}")
+            ok = False
+            continue
+
+        print_day(result)
+
+    return ok
+
+
+def free_threaded() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def run_parallel(args: argparse.Namespace) -> bool:
+    """Run every part of every requested day at the same time, so the whole
+    calendar takes about as long as its slowest part. Results are printed in
+    order once everything is done"""
+
+    # Imported here so a serial run doesn't pay for them
+    from concurrent.futures import (
+        Executor,
+        Future,
+        ProcessPoolExecutor,
+        ThreadPoolExecutor,
+    )
+
+    days = args.days or discover_days()
+    tasks = [(day, part) for day in days for part in args.part or [1, 2]]
+    jobs = args.jobs or os.cpu_count() or 1
+    cache = answer_cache(args)
+
+    # Threads only run in parallel without the GIL, otherwise every task needs
+    # a process of its own
+    executor: Executor
+    if free_threaded():
+        kind = "threads"
+        executor = ThreadPoolExecutor(max_workers=jobs)
+        # Redirecting stdout swaps it for the whole process, which threads
+        # would undo for each other, so it happens once around all of them
+        quiet: contextlib.AbstractContextManager[object] = contextlib.redirect_stdout(
+            io.StringIO()
+        )
+        task = run_day
+    else:
+        kind = "processes"
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        quiet = contextlib.nullcontext()
+        task = run_day_quietly
+
+    start = perf_counter()
+    with quiet, executor:
+        futures: list[Future[DayResult]] = [
+            executor.submit(task, day, [part], cache, args.refresh)
+            for day, part in tasks
+        ]
+        outcomes: list[DayResult | BaseException] = []
+        for future in futures:
+            error = future.exception()
+            outcomes.append(error if error is not None else future.result())
+    wall = perf_counter() - start
+
+    ok = True
+    cpu = 0.0
+    for (day, part), outcome in zip(tasks, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"day {day:02d} part {part}: failed, {outcome}")
+            ok = False
+            continue
+
+        cpu += outcome.cpu
+        for result in outcome.parts:
+            print(
+                f"day {day:02d} part {part}: {result.answer} "
+                f"(solve {result.seconds * 1e3:.3f} ms, "
+                f"total {outcome.total * 1e3:.3f} ms{cache_note(result)})"
+            )
+
+    print(
+        f"{len(tasks)} tasks on {jobs} {kind}: wall {wall * 1e3:.3f} ms, "
+        f"cpu {cpu * 1e3:.3f} ms ({cpu / wall:.2f}x)"
+    )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Advent of Code 2024 solutions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="solve days and time them")
+    run_parser.add_argument(
+        "days", type=int, nargs="*", help="days to run, every installed one if empty"
+    )
+    run_parser.add_argument("--part", type=int, action="append", choices=[1, 2])
+    run_parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="run all parts at once, on threads when the GIL is disabled",
+    )
+    run_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always solve, without reading or storing cached answers",
+    )
+    run_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="solve even when an answer is cached, and store the new one",
+    )
+    run_parser.add_argument(
+        "--jobs", type=int, help="number of parallel workers, one per CPU by default"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        if not (run_parallel(args) if args.parallel else run(args)):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from itertools import repeat
+from operator import add, mod, mul, sub
+from typing import NamedTuple
 
+# Vectors are allocated on every step of every simulation, so they are plain
+# tuples underneath. That makes hashing, comparing and unpacking run in C, at
+# the cost of a Vector comparing equal to a tuple with the same coordinates.
+# New vectors skip the generated __new__ and are built as tuples directly.
+_new: Callable[[type[Vector], tuple[int, int]], Vector] = tuple[int, int].__new__
 
-@dataclass(eq=True, order=True, frozen=True)
-class Vector:
+
+class Vector(NamedTuple):
     x: int
     y: int
 
@@ -12,9 +21,94 @@ class Vector:
         if not isinstance(other, Vector):
             return NotImplemented
 
-        return Vector(self.x + other.x, self.y + other.y)
+        return _new(Vector, (self[0] + other[0], self[1] + other[1]))
 
     def __sub__(self, other: object) -> Vector:
         if not isinstance(other, Vector):
             return NotImplemented
-        return Vector(self.x - other.x, self.y - other.y)
+        return _new(Vector, (self[0] - other[0], self[1] - other[1]))
+
+    # A tuple would repeat itself instead of scaling
+    def __mul__(self, other: object) -> Vector:
+        if not isinstance(other, int):
+            return NotImplemented
+        return _new(Vector, (self[0] * other, self[1] * other))
+
+    __rmul__ = __mul__
+
+
+class VectorArray:
+    """A population of vectors stored as two arrays of coordinates, so that
+    moving all of them is a handful of loops in C instead of a Vector per item"""
+
+    xs: array[int]
+    ys: array[int]
+
+    def __init__(self, xs: Iterable[int] = (), ys: Iterable[int] = ()) -> None:
+        self.xs = array("q", xs)
+        self.ys = array("q", ys)
+
+        if len(self.xs) != len(self.ys):
+            raise ValueError("xs and ys must have the same length")
+
+    @classmethod
+    def from_vectors(cls, vectors: Iterable[Vector]) -> VectorArray:
+        items = list(vectors)
+        return cls((v.x for v in items), (v.y for v in items))
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __getitem__(self, i: int) -> Vector:
+        return Vector(self.xs[i], self.ys[i])
+
+    def __iter__(self) -> Iterator[Vector]:
+        return map(Vector, self.xs, self.ys)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VectorArray):
+            return NotImplemented
+        return self.xs == other.xs and self.ys == other.ys
+
+    def _apply(
+        self, op: Callable[[int, int], int], other: VectorArray | Vector
+    ) -> VectorArray:
+        if isinstance(other, Vector):
+            xs, ys = repeat(other.x, len(self)), repeat(other.y, len(self))
+        else:
+            if len(other) != len(self):
+                raise ValueError("arrays must have the same length")
+            xs, ys = other.xs, other.ys
+
+        return VectorArray(map(op, self.xs, xs), map(op, self.ys, ys))
+
+    def __add__(self, other: VectorArray | Vector) -> VectorArray:
+        return self._apply(add, other)
+
+    def __sub__(self, other: VectorArray | Vector) -> VectorArray:
+        return self._apply(sub, other)
+
+    def __mul__(self, other: int | VectorArray | Vector) -> VectorArray:
+        if isinstance(other, int):
+            return self._apply(mul, Vector(other, other))
+        return self._apply(mul, other)
+
+    def __mod__(self, other: VectorArray | Vector) -> VectorArray:
+        """Wrap every vector around per axis, e.g. positions on a torus"""
+
+        return self._apply(mod, other)
+
+    def in_bounds(self, size: Vector) -> bytearray:
+        """Mask with a 1 for every vector inside [0, size) on both axes"""
+
+        return bytearray(
+            0 <= x < size.x and 0 <= y < size.y for x, y in zip(self.xs, self.ys)
+        )
+
+    def pack(self, width: int) -> array[int]:
+        """Encode every vector as the single int x * width + y, which hashes and
+        compares far cheaper than a Vector. Only unique for 0 <= y < width"""
+
+        return array(
+            "q", map(add, map(mul, self.xs, repeat(width, len(self))), self.ys)
+        )
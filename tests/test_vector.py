@@ -0,0 +1,58 @@
+import random
+from itertools import product
+
+import pytest
+from aoc_2024.vector import Vector, VectorArray
+
+
+def random_vectors(rng: random.Random, n: int) -> list[Vector]:
+    return [Vector(rng.randint(-50, 50), rng.randint(-50, 50)) for _ in range(n)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_arithmetic_matches_vector(seed: int):
+    rng = random.Random(seed)
+    vectors = random_vectors(rng, 100)
+    others = random_vectors(rng, 100)
+    offset = Vector(rng.randint(-50, 50), rng.randint(-50, 50))
+    scale = rng.randint(-5, 5)
+
+    array, other = VectorArray.from_vectors(vectors), VectorArray.from_vectors(others)
+    assert list(array + other) == [a + b for a, b in zip(vectors, others)]
+    assert list(array - other) == [a - b for a, b in zip(vectors, others)]
+    assert list(array + offset) == [v + offset for v in vectors]
+    assert list(array - offset) == [v - offset for v in vectors]
+    assert list(array * scale) == [v * scale for v in vectors]
+
+
+def test_mod_wraps_negative_coordinates():
+    size = Vector(11, 7)
+    vectors = [Vector(x, y) for x, y in product(range(-25, 25), range(-15, 15))]
+
+    wrapped = VectorArray.from_vectors(vectors) % size
+    assert list(wrapped) == [Vector(v.x % size.x, v.y % size.y) for v in vectors]
+    assert all(0 <= v.x < size.x and 0 <= v.y < size.y for v in wrapped)
+
+
+def test_in_bounds():
+    size = Vector(4, 3)
+    vectors = [Vector(x, y) for x, y in product(range(-2, 6), range(-2, 5))]
+
+    mask = VectorArray.from_vectors(vectors).in_bounds(size)
+    assert list(mask) == [0 <= v.x < size.x and 0 <= v.y < size.y for v in vectors]
+
+
+def test_pack_is_unique_for_y_below_width():
+    width = 7
+    vectors = [Vector(x, y) for x, y in product(range(-5, 5), range(width))]
+
+    packed = VectorArray.from_vectors(vectors).pack(width)
+    assert list(packed) == [v.x * width + v.y for v in vectors]
+    assert len(set(packed)) == len(vectors)
+
+
+def test_mismatched_lengths():
+    with pytest.raises(ValueError):
+        VectorArray([1, 2], [3])
+    with pytest.raises(ValueError):
+        _ = VectorArray([1, 2], [3, 4]) + VectorArray([1], [2])